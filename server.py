@@ -6,25 +6,55 @@ Serves Astro static build + API endpoints for application submissions
 
 import asyncio
 import base64
+import bisect
+import gzip
+import hashlib
+import heapq
 import json
 import logging
+import math
 import mimetypes
 import os
+import random
 import re
+import secrets
+import shutil
+import socket
+import sqlite3
 import subprocess
+import time
 import uuid
+from array import array
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, TypedDict
 
 import aiohttp
+import asyncssh
 from dotenv import load_dotenv
-from fastapi import FastAPI, Form, Request, UploadFile, File, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from jinja2 import Environment, FileSystemLoader
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
 import uvicorn
 
+try:
+    import brotli
+except ImportError:  # optional; without it only gzip variants are built
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: the leader lock uses msvcrt instead
+    fcntl = None
+    import msvcrt
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -32,21 +62,100 @@ logger = logging.getLogger(__name__)
 
 # SparkPost configuration
 SPARKPOST_API_KEY = os.getenv("SPARKPOST_KEY", "")
-SPARKPOST_API_URL = "https://api.sparkpost.com/api/v1/transmissions"
+SPARKPOST_API_URL = os.getenv("SPARKPOST_API_URL", "https://api.sparkpost.com/api/v1/transmissions")
 FROM_EMAIL = "info@qsub.net"
 FROM_NAME = "QUANTA Applications"
 NOTIFICATION_EMAILS = ["info@qsub.net"]
+SPARKPOST_TIMEOUT = float(os.getenv("SPARKPOST_TIMEOUT", "15"))  # seconds per request
+SPARKPOST_CONNECT_TIMEOUT = float(os.getenv("SPARKPOST_CONNECT_TIMEOUT", "5"))  # seconds
+SPARKPOST_MAX_CONNECTIONS = 4  # pooled keep-alive connections to the SparkPost host
+SPARKPOST_BATCH_SIZE = 50  # recipients per batched transmission
+ATTACHMENT_CHUNK_SIZE = 48 * 1024  # bytes read per chunk when streaming attachments (multiple of 3)
+
+# Shared HTTP client, created on first use and closed on shutdown
+http_session: Optional[aiohttp.ClientSession] = None
 
 # File upload configuration
 UPLOAD_DIR = Path("data/applications/uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+UPLOAD_TMP_DIR = UPLOAD_DIR / ".incoming"  # same filesystem so the final rename is atomic
+UPLOAD_TMP_DIR.mkdir(parents=True, exist_ok=True)
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_FORM_OVERHEAD = 64 * 1024  # allowance for multipart headers when checking Content-Length
 ALLOWED_EXTENSIONS = {".pdf", ".doc", ".docx"}
+# Leading bytes each allowed file type must start with
+FILE_SIGNATURES = {
+    ".pdf": (b"%PDF-",),
+    ".doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", b"{\\rtf"),  # OLE2 compound file, or RTF saved as .doc
+    ".docx": (b"PK\x03\x04",),  # ZIP container
+}
+FILE_SNIFF_BYTES = 8
+UPLOAD_ORPHAN_TTL = 24 * 60 * 60  # seconds before an upload never attached to an application is collected
+UPLOAD_GC_INTERVAL = 60 * 60  # seconds between garbage collection runs
+UPLOAD_MAX_CONCURRENT = 8  # uploads being received at once across all clients
+UPLOAD_MAX_CONCURRENT_PER_IP = 2  # uploads being received at once from one client
+UPLOAD_BUSY_RETRY_AFTER = 5  # seconds suggested to clients turned away by the concurrency caps
+
+# Per-IP token buckets for write endpoints: (burst, seconds to refill the full burst)
+RATE_LIMITS = {
+    "apply": (5, 60 * 60),
+    "contact": (5, 60 * 60),
+    "upload": (10, 60 * 60),
+}
+RATE_LIMIT_MAX_CLIENTS = 10000  # tracked IPs per endpoint before the least recently seen are forgotten
 
 # Static files directory (Astro build output)
 DIST_DIR = Path(__file__).parent / "dist"
+STATIC_RELOAD = os.getenv("STATIC_RELOAD", "").lower() in ("1", "true", "yes")  # rebuild when dist/ changes (dev)
+STATIC_WATCH_INTERVAL = 2  # seconds between dist/ change checks when STATIC_RELOAD is set
+STATIC_CACHE_MAX_FILE = 4 * 1024 * 1024  # larger files are served from disk rather than held in memory
+STATIC_COMPRESS_MIN_SIZE = 1024  # smaller files are sent uncompressed
+STATIC_COMPRESS_TYPES = {
+    "text/html", "text/css", "text/plain", "text/javascript", "application/javascript",
+    "application/json", "application/xml", "image/svg+xml", "application/manifest+json",
+}
+STATIC_IMMUTABLE_DIR = "_astro/"  # content-hashed bundles, never change under the same name
+STATIC_IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+STATIC_REVALIDATE_CACHE = "no-cache"  # cache, but revalidate with the ETag on every use
+
+# Documents served under /docs (PDF specs), looked up in dist first, then public
+DOCS_DIRS = (DIST_DIR / "docs", Path(__file__).parent / "public" / "docs")
+DOCS_CHUNK_SIZE = 256 * 1024  # bytes read per body chunk when streaming a document
+DOCS_MEDIA_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+TECH_SPEC_DOC = "QUANTA_Technical_Specification_v4.pdf"
+
 
-app = FastAPI(title="QSUB.NET", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background collectors on startup and release resources on shutdown."""
+    await asyncio.to_thread(build_static_manifest)
+    await asyncio.to_thread(build_docs_index)
+    await load_dash_history()
+    await start_worker_coordination()
+    background_tasks = []
+    if STATIC_RELOAD:
+        background_tasks.append(asyncio.create_task(watch_static_dir()))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await stop_worker_coordination()
+    await close_http_session()
+    await close_app_db()
+    if miner_log_task is not None:
+        miner_log_task.cancel()
+    if node_probe_task is not None:
+        node_probe_task.cancel()
+    await stop_metagraph_agent()
+    await close_ssh_pool()
+
+
+app = FastAPI(title="QSUB.NET", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware - allow requests from both http and https versions of qsub.net
 app.add_middleware(
@@ -64,9 +173,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for applications
-applications = []
-uploaded_files = {}
+# Application storage (SQLite in WAL mode, see APPLICATION STORAGE below)
+APP_DB_PATH = Path("data/applications/applications.db")
+APP_DB_BATCH_SIZE = 50  # max writes committed in one transaction
+APP_DB_BATCH_DELAY = 0.02  # seconds to wait for more writes before committing
+APP_PAGE_SIZE = 50  # default /api/applications page size
+APP_MAX_PAGE_SIZE = 500
+
+# Outbound email queue (stored in the application database)
+OUTBOX_WORKERS = 2  # concurrent deliveries
+OUTBOX_MAX_ATTEMPTS = 8  # attempts before a message is dead-lettered
+OUTBOX_BACKOFF_BASE = 5  # seconds before the first retry, doubled each attempt
+OUTBOX_BACKOFF_MAX = 30 * 60  # cap on the retry delay in seconds
+OUTBOX_POLL_INTERVAL = 30  # seconds between checks for due retries when idle
+
+# Multi-worker mode: one elected worker runs collectors, history, outbox and
+# upload GC, and streams dashboard snapshots to the others over localhost TCP
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+WORKER_LOCK_FILE = Path("data/worker.lock")  # whoever holds the OS lock on it is the leader
+WORKER_IPC_HOST = "127.0.0.1"
+WORKER_IPC_PORT = int(os.getenv("WORKER_IPC_PORT", "8090"))  # the leader serves snapshots here
+WORKER_IPC_VERSION = 1  # sent in the handshake; bump when the message format changes
+WORKER_IPC_HELLO_TIMEOUT = 5  # seconds a follower waits for the leader's handshake
+WORKER_IPC_RETRY = 2  # seconds between reconnect / takeover attempts by followers
+WORKER_SNAPSHOT_WAIT = 3  # seconds a follower request waits for the leader's first snapshot
+WORKER_METRICS_INTERVAL = 5  # seconds between metric pushes to the leader and merged broadcasts back
+WORKER_IPC_MAX_MESSAGE = 16 * 1024 * 1024  # bytes per newline-delimited JSON message
+WORKER_IPC_MAX_BUFFER = 4 * 1024 * 1024  # unsent bytes before a slow follower is disconnected
 
 # Area labels mapping
 AREA_LABELS = {
@@ -79,6 +212,300 @@ AREA_LABELS = {
     "other": "Other",
 }
 
+# Email templates, compiled once at import; user fields are HTML-escaped on render
+EMAIL_TEMPLATE_DIR = Path(__file__).parent / "templates" / "email"
+EMAIL_TEMPLATE_NAMES = ("team_notification", "applicant_confirmation", "contact_notification")
+email_env = Environment(
+    loader=FileSystemLoader(str(EMAIL_TEMPLATE_DIR)),
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+)
+EMAIL_TEMPLATES = {name: email_env.get_template(f"{name}.html") for name in EMAIL_TEMPLATE_NAMES}
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+# Prometheus text exposition of in-process counters, served at /metrics.
+# Updates are plain dict arithmetic on the event loop thread, cheap enough for hot paths.
+METRICS: List["Counter"] = []
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 10 * 1024 * 1024)
+
+
+def metric_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    """Format a label set, e.g. {source="nodes",le="0.5"}."""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter, one value per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values: Dict[tuple, float] = {}
+        METRICS.append(self)
+
+    def inc(self, *label_values, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        for label_values, value in self.values.items():
+            yield self.name + metric_labels(self.labels, label_values), value
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        return self.header() + [f"{series} {value}" for series, value in self.samples()]
+
+
+class Gauge(Counter):
+    """Point-in-time value; either set directly or computed by collect() at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), collect=None):
+        super().__init__(name, help_text, labels)
+        self.collect = collect  # returns {label_values: value}
+
+    def set(self, value: float, *label_values):
+        self.values[label_values] = value
+
+    def samples(self):
+        if self.collect is not None:
+            self.values = self.collect()
+        yield from super().samples()
+
+
+class Histogram(Counter):
+    """Cumulative-bucket histogram with sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, *label_values):
+        state = self.values.get(label_values)
+        if state is None:
+            # Per-bucket counts (last slot is +Inf), sum, count
+            state = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self):
+        for label_values, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{metric_labels(self.labels, label_values, le)}", cumulative
+            yield f"{self.name}_sum{metric_labels(self.labels, label_values)}", total
+            yield f"{self.name}_count{metric_labels(self.labels, label_values)}", count
+
+
+def metric_samples() -> Dict[str, list]:
+    """This process's samples as {metric name: [[series, value], ...]}, for sending to the leader."""
+    return {metric.name: [[series, value] for series, value in metric.samples()] for metric in METRICS}
+
+
+def with_label(series: str, label: str) -> str:
+    """Add a formatted label (e.g. worker="123") to a series name."""
+    name, brace, rest = series.partition("{")
+    return f"{name}{{{label},{rest}" if brace else f"{name}{{{label}}}"
+
+
+def render_metrics(workers: Optional[Dict[str, dict]] = None) -> str:
+    """Render every registered metric in Prometheus text format.
+
+    With workers ({worker id: metric_samples()}), every worker's series are
+    rendered side by side under a worker label.
+    """
+    lines = []
+    for metric in METRICS:
+        if workers is None:
+            lines.extend(metric.render())
+            continue
+        lines.extend(metric.header())
+        for worker, samples in workers.items():
+            label = metric_labels(("worker",), (worker,))[1:-1]
+            lines.extend(f"{with_label(series, label)} {value}" for series, value in samples.get(metric.name, []))
+    return "\n".join(lines) + "\n"
+
+
+class ServeTimingMiddleware:
+    """Time static and /docs responses end to end, including sending the body."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path.startswith(("/api/", "/ws/", "/metrics")):
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            kind = "docs" if path.startswith("/docs/") else "static"
+            static_serve_duration.observe(time.perf_counter() - started, kind, status)
+
+
+app.add_middleware(ServeTimingMiddleware)
+
+dash_source_duration = Histogram(
+    "qsub_dash_source_duration_seconds", "Dashboard collector refresh duration", ("source",))
+dash_source_failures = Counter(
+    "qsub_dash_source_failures_total", "Dashboard collector failures by source and reason", ("source", "reason"))
+dash_cache_requests = Counter(
+    "qsub_dash_cache_requests_total", "Dashboard snapshot lookups by cache outcome (hit, stale, miss)", ("result",))
+ws_connections = Gauge(
+    "qsub_ws_connections", "Connected /ws/dash clients",
+    collect=lambda: {(): len(dash_connections)})
+ws_send_queue_depth = Gauge(
+    "qsub_ws_send_queue_depth", "Frames waiting in /ws/dash send queues", ("stat",),
+    collect=lambda: {
+        ("total",): sum(q.qsize() for q in dash_connections.values()),
+        ("max",): max((q.qsize() for q in dash_connections.values()), default=0),
+    })
+ws_queue_overflows = Counter(
+    "qsub_ws_queue_overflows_total", "Times a lagging /ws/dash client's queue was collapsed to a full frame")
+upload_size = Histogram(
+    "qsub_upload_size_bytes", "Accepted resume upload sizes", buckets=SIZE_BUCKETS)
+upload_rejections = Counter(
+    "qsub_upload_rejections_total", "Rejected resume uploads by HTTP status", ("status",))
+rate_limit_rejections = Counter(
+    "qsub_rate_limit_rejections_total", "Write requests turned away with 429", ("endpoint", "reason"))
+email_send_duration = Histogram(
+    "qsub_email_send_duration_seconds", "SparkPost transmission latency", ("email", "outcome"))
+static_serve_duration = Histogram(
+    "qsub_static_serve_duration_seconds", "Static and /docs response time", ("kind", "status"))
+command_duration = Histogram(
+    "qsub_command_duration_seconds", "Collector command latency", ("command",))
+command_failures = Counter(
+    "qsub_command_failures_total", "Collector commands that exited non-zero or timed out", ("command", "reason"))
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared HTTP client (keep-alive pooled) used for SparkPost calls."""
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=SPARKPOST_MAX_CONNECTIONS, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=SPARKPOST_TIMEOUT, connect=SPARKPOST_CONNECT_TIMEOUT),
+        )
+    return http_session
+
+
+async def close_http_session():
+    """Close the shared HTTP client."""
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+
+
+def stream_transmission_body(payload: dict, attachment: dict):
+    """Build a transmission body that base64-encodes an attachment as it is sent.
+
+    The JSON around the attachment data is serialized up front; the file is
+    read off the event loop in chunks that are a multiple of 3 bytes, so each
+    chunk encodes independently and only one chunk is in memory at a time.
+    Returns the body generator and its exact length.
+    """
+    # Unguessable per call, so no user-supplied field can collide with it
+    marker = f"__attachment_{secrets.token_hex(16)}__"
+    content = dict(payload["content"], attachments=[{"name": attachment["name"], "type": attachment["type"], "data": marker}])
+    prefix, suffix = json.dumps({**payload, "content": content}).encode().split(f'"{marker}"'.encode(), 1)
+    length = len(prefix) + len(suffix) + 2 + 4 * ((attachment["size"] + 2) // 3)
+
+    async def body():
+        yield prefix + b'"'
+        handle = await asyncio.to_thread(open, attachment["path"], "rb")
+        try:
+            while chunk := await asyncio.to_thread(handle.read, ATTACHMENT_CHUNK_SIZE):
+                yield base64.b64encode(chunk)
+        finally:
+            await asyncio.to_thread(handle.close)
+        yield b'"' + suffix
+
+    return body(), length
+
+
+async def post_transmission(payload: dict, description: str, attachment: Optional[dict] = None) -> bool:
+    """Send one SparkPost transmission over the shared client.
+
+    An attachment ({name, type, path, size}) is streamed from disk rather than
+    embedded in the payload.
+    """
+    headers = {
+        "Authorization": SPARKPOST_API_KEY,
+        "Content-Type": "application/json",
+    }
+    if attachment:
+        body, length = stream_transmission_body(payload, attachment)
+        request = {"data": body, "headers": {**headers, "Content-Length": str(length)}}
+    else:
+        request = {"json": payload, "headers": headers}
+
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        async with get_http_session().post(SPARKPOST_API_URL, **request) as response:
+            if response.status == 200:
+                outcome = "sent"
+                return True
+            outcome = "rejected"
+            error = await response.text()
+            logger.error(f"SparkPost error sending {description}: {response.status} - {error}")
+            return False
+    except Exception as e:
+        logger.error(f"Failed to send {description}: {e}")
+        return False
+    finally:
+        email_send_duration.observe(time.perf_counter() - started, description, outcome)
+
+
+def render_email(name: str, **context) -> str:
+    """Render a precompiled email template."""
+    return EMAIL_TEMPLATES[name].render(**context)
+
+
+@lru_cache(maxsize=None)
+def render_static_email(name: str) -> str:
+    """Render a template with no per-message fields once and reuse the result."""
+    return render_email(name)
+
+
+def link_href(url: str) -> Optional[str]:
+    """Return url if it is safe to use as a link target (http/https only)."""
+    if re.match(r"https?://", url or "", re.IGNORECASE):
+        return url
+    return None
+
 
 def get_areas_labels(areas: list) -> str:
     """Convert area codes to labels."""
@@ -87,96 +514,31 @@ def get_areas_labels(areas: list) -> str:
     return ", ".join(AREA_LABELS.get(a, a) for a in areas)
 
 
+def team_notification_context(data: dict) -> dict:
+    """Build the template context for the team notification of an application."""
+    areas = data.get('areas', [])
+    resume_file = data.get('resume_file') or {}
+    return {
+        "data": data,
+        "areas_label": get_areas_labels(areas),
+        "area_labels": [AREA_LABELS.get(a, a) for a in areas],
+        "portfolio_href": link_href(data.get('portfolio', '')),
+        "resume_kb": round(resume_file.get('size', 0) / 1024),
+        "submitted_at": data.get('submitted_at', datetime.now().isoformat()),
+    }
+
+
 async def send_team_notification(data: dict) -> bool:
     """Send notification email to team about new application."""
     if not SPARKPOST_API_KEY:
         logger.warning("SparkPost API key not configured, skipping team notification")
         return False
 
-    areas = data.get('areas', [])
-    areas_label = get_areas_labels(areas)
-
-    html_content = f"""
-    <html>
-    <head>
-        <style>
-            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f8f9fb; padding: 20px; }}
-            .container {{ max-width: 600px; margin: 0 auto; background: white; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 12px rgba(0,0,0,0.1); }}
-            .header {{ background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 50%, #a855f7 100%); padding: 24px; }}
-            .header h1 {{ margin: 0; color: white; font-size: 20px; font-weight: 600; }}
-            .header p {{ margin: 8px 0 0; color: rgba(255,255,255,0.9); font-size: 14px; }}
-            .content {{ padding: 24px; }}
-            .field {{ margin-bottom: 16px; }}
-            .field-label {{ font-size: 12px; font-weight: 600; color: #6b7280; text-transform: uppercase; letter-spacing: 0.5px; margin-bottom: 4px; }}
-            .field-value {{ font-size: 15px; color: #111827; }}
-            .field-value a {{ color: #6366f1; text-decoration: none; }}
-            .experience {{ background: #f8f9fb; border-radius: 8px; padding: 12px; font-size: 14px; color: #374151; line-height: 1.6; white-space: pre-wrap; }}
-            .badge {{ display: inline-block; background: #eef2ff; color: #4f46e5; padding: 4px 10px; border-radius: 12px; font-size: 12px; font-weight: 500; }}
-            .footer {{ padding: 16px 24px; background: #f8f9fb; border-top: 1px solid #e5e7eb; font-size: 12px; color: #6b7280; }}
-            .early-stage {{ margin-top: 16px; padding: 12px; background: #fef3c7; border-radius: 8px; font-size: 13px; color: #92400e; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>New Application Received</h1>
-                <p>{data.get('name', 'Unknown')} &middot; {areas_label}</p>
-            </div>
-            <div class="content">
-                <div class="field">
-                    <div class="field-label">Name</div>
-                    <div class="field-value">{data.get('name', 'N/A')}</div>
-                </div>
-                <div class="field">
-                    <div class="field-label">Email</div>
-                    <div class="field-value"><a href="mailto:{data.get('email', '')}">{data.get('email', 'N/A')}</a></div>
-                </div>
-                <div class="field">
-                    <div class="field-label">Location / Time Zone</div>
-                    <div class="field-value">{data.get('location', 'Not provided')}</div>
-                </div>
-                {f'''<div class="field">
-                    <div class="field-label">Social Handles</div>
-                    <div class="field-value">
-                        {f"Discord: {data.get('discord')}" if data.get('discord') else ""}
-                        {" &middot; " if data.get('discord') and (data.get('twitter') or data.get('telegram')) else ""}
-                        {f"X: {data.get('twitter')}" if data.get('twitter') else ""}
-                        {" &middot; " if data.get('twitter') and data.get('telegram') else ""}
-                        {f"Telegram: {data.get('telegram')}" if data.get('telegram') else ""}
-                    </div>
-                </div>''' if data.get('discord') or data.get('twitter') or data.get('telegram') else ''}
-                <div class="field">
-                    <div class="field-label">Areas of Interest</div>
-                    <div class="field-value">{''.join(f'<span class="badge" style="margin-right: 6px; margin-bottom: 4px;">{AREA_LABELS.get(a, a)}</span>' for a in areas) if areas else 'None specified'}</div>
-                </div>
-                {f'''<div class="field">
-                    <div class="field-label">Portfolio Link</div>
-                    <div class="field-value"><a href="{data.get('portfolio')}" target="_blank">{data.get('portfolio')}</a></div>
-                </div>''' if data.get('portfolio') else ''}
-                {f'''<div class="field">
-                    <div class="field-label">Resume File</div>
-                    <div class="field-value">{data.get('resume_file', {}).get('original_name', 'Uploaded')} ({round(data.get('resume_file', {}).get('size', 0) / 1024)}KB)</div>
-                </div>''' if data.get('resume_file') else ''}
-                <div class="field">
-                    <div class="field-label">Relevant Experience</div>
-                    <div class="experience">{data.get('experience', 'Not provided')}</div>
-                </div>
-                {f'''<div class="field">
-                    <div class="field-label">How They'd Like to Contribute</div>
-                    <div class="experience">{data.get('contribution', '')}</div>
-                </div>''' if data.get('contribution') else ''}
-                {f'''<div class="early-stage">
-                    &#x2714; Confirmed comfortable with early-stage experimental project
-                </div>''' if data.get('early_stage') else ''}
-            </div>
-            <div class="footer">
-                Submitted: {data.get('submitted_at', datetime.now().isoformat())}<br>
-                Source IP: {data.get('ip', 'Unknown')}
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    context = team_notification_context(data)
+    areas_label = context["areas_label"]
+    resume_file = data.get('resume_file') or {}
+
+    html_content = render_email("team_notification", **context)
 
     payload = {
         "recipients": [{"address": email} for email in NOTIFICATION_EMAILS],
@@ -188,102 +550,59 @@ async def send_team_notification(data: dict) -> bool:
         },
     }
 
-    # Add attachment if resume file exists
-    resume_file = data.get('resume_file')
-    if resume_file and resume_file.get('path'):
+    # Add attachment if resume file exists (encoded while streaming the request)
+    attachment = None
+    if resume_file.get('path'):
         try:
             file_path = Path(resume_file['path'])
-            if file_path.exists():
-                with open(file_path, 'rb') as f:
-                    file_content = f.read()
-
-                # Get MIME type
-                mime_type, _ = mimetypes.guess_type(resume_file.get('original_name', 'file'))
-                if not mime_type:
-                    mime_type = 'application/octet-stream'
-
-                # Add attachment to payload
-                payload["content"]["attachments"] = [{
-                    "name": resume_file.get('original_name', 'resume'),
-                    "type": mime_type,
-                    "data": base64.b64encode(file_content).decode('utf-8'),
-                }]
-                logger.info(f"Attached file: {resume_file.get('original_name')} ({len(file_content)} bytes)")
+            size = (await asyncio.to_thread(file_path.stat)).st_size
+
+            # Get MIME type
+            mime_type, _ = mimetypes.guess_type(resume_file.get('original_name', 'file'))
+            if not mime_type:
+                mime_type = 'application/octet-stream'
+
+            attachment = {
+                "name": resume_file.get('original_name', 'resume'),
+                "type": mime_type,
+                "path": file_path,
+                "size": size,
+            }
+            logger.info(f"Attached file: {resume_file.get('original_name')} ({size} bytes)")
         except Exception as e:
             logger.error(f"Failed to attach resume file: {e}")
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                SPARKPOST_API_URL,
-                json=payload,
-                headers={
-                    "Authorization": SPARKPOST_API_KEY,
-                    "Content-Type": "application/json",
-                },
-            ) as response:
-                if response.status == 200:
-                    logger.info(f"Team notification sent for application from {data.get('name')}")
-                    return True
-                else:
-                    error = await response.text()
-                    logger.error(f"SparkPost error sending team notification: {response.status} - {error}")
-                    return False
-    except Exception as e:
-        logger.error(f"Failed to send team notification: {e}")
-        return False
+    if await post_transmission(payload, "team notification", attachment):
+        logger.info(f"Team notification sent for application from {data.get('name')}")
+        return True
+    return False
 
 
 async def send_applicant_confirmation(data: dict) -> bool:
     """Send confirmation email to applicant."""
+    return await send_applicant_confirmations([data])
+
+
+async def send_applicant_confirmations(batch: List[dict]) -> bool:
+    """Send confirmation emails to several applicants in one transmission.
+
+    The body is shared; each recipient's first name is filled in by SparkPost
+    substitution (which HTML-escapes it).
+    """
     if not SPARKPOST_API_KEY:
         logger.warning("SparkPost API key not configured, skipping applicant confirmation")
         return False
 
-    html_content = f"""
-    <html>
-    <head>
-        <style>
-            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f8f9fb; padding: 20px; }}
-            .container {{ max-width: 600px; margin: 0 auto; background: white; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 12px rgba(0,0,0,0.1); }}
-            .header {{ background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 50%, #a855f7 100%); padding: 32px 24px; text-align: center; }}
-            .logo {{ width: 48px; height: 48px; background: rgba(255,255,255,0.2); border-radius: 12px; display: inline-flex; align-items: center; justify-content: center; font-weight: 700; font-size: 24px; color: white; margin-bottom: 16px; }}
-            .header h1 {{ margin: 0; color: white; font-size: 22px; font-weight: 600; }}
-            .content {{ padding: 32px 24px; }}
-            .content p {{ font-size: 15px; color: #374151; line-height: 1.7; margin-bottom: 16px; }}
-            .content p:last-child {{ margin-bottom: 0; }}
-            .highlight {{ background: #f8f9fb; border-radius: 8px; padding: 16px; margin: 20px 0; }}
-            .highlight p {{ margin: 0; font-size: 14px; color: #6b7280; }}
-            .footer {{ padding: 20px 24px; background: #f8f9fb; border-top: 1px solid #e5e7eb; text-align: center; }}
-            .footer p {{ font-size: 13px; color: #6b7280; margin: 0; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <div class="logo">Q</div>
-                <h1>Application Received</h1>
-            </div>
-            <div class="content">
-                <p>Hi {data.get('name', '').split()[0] if data.get('name') else 'there'},</p>
-                <p>Thank you for your interest in the QUANTA project. We've received your application and wanted to confirm that it's in our queue for review.</p>
-                <p>We're a small team and we review every submission personally. If there's a strong fit as the project progresses, we'll reach out to start a conversation.</p>
-                <div class="highlight">
-                    <p>In the meantime, feel free to follow our progress. We're building something we think is genuinely interesting in the decentralized intelligence space.</p>
-                </div>
-                <p>Thanks again for taking the time to reach out.</p>
-                <p>&mdash; The QUANTA Team</p>
-            </div>
-            <div class="footer">
-                <p>QUANTA</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    html_content = render_static_email("applicant_confirmation")
 
     payload = {
-        "recipients": [{"address": data.get('email')}],
+        "recipients": [
+            {
+                "address": data.get('email'),
+                "substitution_data": {"first_name": data.get('name', '').split()[0] if data.get('name') else 'there'},
+            }
+            for data in batch
+        ],
         "content": {
             "from": {"email": FROM_EMAIL, "name": FROM_NAME},
             "subject": "QUANTA - Application Received",
@@ -291,109 +610,450 @@ async def send_applicant_confirmation(data: dict) -> bool:
         },
     }
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                SPARKPOST_API_URL,
-                json=payload,
-                headers={
-                    "Authorization": SPARKPOST_API_KEY,
-                    "Content-Type": "application/json",
-                },
-            ) as response:
-                if response.status == 200:
-                    logger.info(f"Confirmation email sent to {data.get('email')}")
-                    return True
-                else:
-                    error = await response.text()
-                    logger.error(f"SparkPost error sending confirmation: {response.status} - {error}")
-                    return False
-    except Exception as e:
-        logger.error(f"Failed to send confirmation email: {e}")
-        return False
+    if await post_transmission(payload, "confirmation"):
+        logger.info(f"Confirmation email sent to {', '.join(data.get('email', '') for data in batch)}")
+        return True
+    return False
 
 
 # =============================================================================
 # DASHBOARD MONITORING
 # =============================================================================
 
-# Configuration for Pi cluster nodes
-# Localnet: everything runs on rpi5 (subtensor alice/bob, validator, miner)
-CLUSTER_NODES = [
-    {
-        "name": "Localnet Node (rpi5)",
-        "hostname": "rpi5",
-        "ip": "10.20.0.11",
-        "user": "jhirschfeld",
-        "role": "full-node",  # Runs subtensor, validator, and miner
-    },
-]
+# Cluster node inventory (JSON list of {name, hostname, ip, user, role}, plus
+# optional "local" and "probe_interval"); the full-node runs subtensor, validator and miner
+CLUSTER_NODES_FILE = Path(os.getenv("CLUSTER_NODES_FILE", str(Path(__file__).parent / "cluster_nodes.json")))
+CLUSTER_NODE_FIELDS = ("name", "hostname", "ip", "user", "role")
+
+
+def load_cluster_nodes() -> List[dict]:
+    """Read the node inventory, skipping incomplete or duplicate entries."""
+    try:
+        entries = json.loads(CLUSTER_NODES_FILE.read_text())
+    except FileNotFoundError:
+        logger.warning(f"Cluster node inventory {CLUSTER_NODES_FILE} not found")
+        return []
+    except ValueError as e:
+        logger.error(f"Invalid cluster node inventory {CLUSTER_NODES_FILE}: {e}")
+        return []
+
+    nodes = []
+    seen = set()
+    for entry in entries if isinstance(entries, list) else []:
+        missing = [field for field in CLUSTER_NODE_FIELDS if not isinstance(entry, dict) or not entry.get(field)]
+        if missing:
+            logger.warning(f"Skipping cluster node {entry!r}: missing {', '.join(missing)}")
+            continue
+        if entry["hostname"] in seen:
+            logger.warning(f"Skipping duplicate cluster node {entry['hostname']}")
+            continue
+        seen.add(entry["hostname"])
+        nodes.append(entry)
+    logger.info(f"Loaded {len(nodes)} cluster nodes from {CLUSTER_NODES_FILE}")
+    return nodes
+
+
+CLUSTER_NODES = load_cluster_nodes()
+
+# Command execution: local programs and remote commands share one bounded runner
+COMMAND_CONCURRENCY = 16  # commands running at once across all collectors
+COMMAND_MAX_OUTPUT = 4 * 1024 * 1024  # stdout bytes kept per command; anything beyond is drained and dropped
+COMMAND_READ_SIZE = 64 * 1024
+command_semaphore = asyncio.Semaphore(COMMAND_CONCURRENCY)
+
+# SSH connection pool configuration
+SSH_CONNECT_TIMEOUT = 5  # seconds
+SSH_KEEPALIVE_INTERVAL = 15  # seconds between keepalives on idle connections
+SSH_HEALTH_INTERVAL = 30  # seconds between health checks of a pooled connection
+
+# One persistent SSH connection per cluster node, keyed by hostname
+ssh_pool: Dict[str, dict] = {}
+chain_node_missing_logged = False
+
+
+def get_chain_node() -> Optional[dict]:
+    """Return the node running subtensor and the signal pool miner (None if there are no nodes)."""
+    global chain_node_missing_logged
+    if not CLUSTER_NODES:
+        if not chain_node_missing_logged:
+            logger.warning("No cluster nodes configured; chain data will stay at its defaults")
+            chain_node_missing_logged = True
+        return None
+    return next((n for n in CLUSTER_NODES if n["role"] == "full-node"), CLUSTER_NODES[0])
+
+
+async def get_ssh_connection(node: dict) -> asyncssh.SSHClientConnection:
+    """Return a pooled SSH connection to a node, reconnecting if it has died.
+
+    Connections are health checked at most every SSH_HEALTH_INTERVAL seconds;
+    a failed check drops the connection and a fresh one is opened.
+    """
+    entry = ssh_pool.setdefault(node["hostname"], {"conn": None, "checked": None, "lock": asyncio.Lock()})
+
+    async with entry["lock"]:
+        conn = entry["conn"]
+        if conn is not None and conn.is_closed():
+            conn = None
+
+        if conn is not None and (datetime.now() - entry["checked"]).total_seconds() >= SSH_HEALTH_INTERVAL:
+            try:
+                await asyncio.wait_for(conn.run("true", check=True), timeout=SSH_CONNECT_TIMEOUT)
+                entry["checked"] = datetime.now()
+            except Exception as e:
+                logger.warning(f"SSH connection to {node['hostname']} failed health check: {e}")
+                conn.close()
+                conn = None
+
+        if conn is None:
+            conn = await asyncio.wait_for(
+                asyncssh.connect(
+                    node["hostname"],
+                    username=node["user"],
+                    keepalive_interval=SSH_KEEPALIVE_INTERVAL,
+                ),
+                timeout=SSH_CONNECT_TIMEOUT,
+            )
+            entry["checked"] = datetime.now()
+            logger.info(f"SSH connection established to {node['user']}@{node['hostname']}")
+
+        entry["conn"] = conn
+        return conn
+
+
+def drop_ssh_connection(node: dict):
+    """Close a node's pooled connection so the next command reconnects."""
+    entry = ssh_pool.get(node["hostname"])
+    if entry and entry["conn"] is not None:
+        entry["conn"].close()
+        entry["conn"] = None
+
+
+async def close_ssh_pool():
+    """Close every pooled SSH connection."""
+    for entry in ssh_pool.values():
+        if entry["conn"] is not None:
+            entry["conn"].close()
+            await entry["conn"].wait_closed()
+            entry["conn"] = None
+
+
+def record_command(label: str, seconds: float, outcome: str):
+    """Record one command run's latency and outcome in the metrics."""
+    command_duration.observe(seconds, label)
+    if outcome != "ok":
+        command_failures.inc(label, outcome)
+    if outcome == "timeout":
+        logger.warning(f"Command '{label}' timed out after {seconds:.1f}s and was killed")
+
+
+async def read_capped(stream, limit: int, keep_line: Optional[Callable[[bytes], bool]] = None) -> bytes:
+    """Read a stream to EOF, keeping at most limit bytes.
+
+    With keep_line, output is split into lines as it arrives and only the
+    lines it accepts are kept, so banners and notices never count against
+    the limit or sit in memory.
+    """
+    chunks = []
+    kept = 0
+    partial = b""
+    while chunk := await stream.read(COMMAND_READ_SIZE):
+        if keep_line is not None:
+            lines = (partial + chunk).split(b"\n")
+            partial = lines.pop()[:limit]  # an over-long line is cut at the limit
+            chunk = b"".join(line + b"\n" for line in lines if keep_line(line))
+        if kept < limit:
+            chunks.append(chunk[:limit - kept])
+            kept += len(chunks[-1])
+    if partial and keep_line(partial) and kept < limit:
+        chunks.append(partial[:limit - kept])
+    return b"".join(chunks)
+
+
+async def run_command(label: str, argv: List[str], timeout: float, max_output: int = COMMAND_MAX_OUTPUT,
+                      keep_line: Optional[Callable[[bytes], bool]] = None) -> bytes:
+    """Run a local program (no shell) and return its stdout (only the lines keep_line accepts, if given).
+
+    On timeout or cancellation the process is killed and reaped before the
+    error propagates, so a hung command never outlives its caller.
+    """
+    async with command_semaphore:
+        started = time.monotonic()
+        outcome = "error"
+        process = None
+        try:
+            # which() resolves PATHEXT wrappers such as pm2.cmd on Windows
+            program = shutil.which(argv[0]) or argv[0]
+            process = await asyncio.create_subprocess_exec(
+                program, *argv[1:],
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+
+            async def communicate():
+                output = await read_capped(process.stdout, max_output, keep_line)
+                await process.wait()
+                return output
+
+            stdout = await asyncio.wait_for(communicate(), timeout=timeout)
+            outcome = "ok" if process.returncode == 0 else "error"
+            return stdout
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            if process is not None and process.returncode is None:
+                process.kill()
+                await process.wait()
+            record_command(label, time.monotonic() - started, outcome)
+
+
+async def run_remote(node: dict, command: str, timeout: float, encoding: Optional[str] = "utf-8",
+                     label: str = "remote", max_output: int = COMMAND_MAX_OUTPUT):
+    """Run a shell command on a node over its pooled connection and return stdout.
+
+    Pass encoding=None to get raw bytes. On timeout the remote process is sent
+    SIGKILL and its channel closed.
+    """
+    async with command_semaphore:
+        started = time.monotonic()
+        outcome = "error"
+        process = None
+        try:
+            conn = await get_ssh_connection(node)
+            process = await conn.create_process(command, encoding=None, stdin=asyncssh.DEVNULL)
+
+            async def communicate():
+                output = await read_capped(process.stdout, max_output)
+                await process.wait(check=False)
+                return output
+
+            stdout = await asyncio.wait_for(communicate(), timeout=timeout)
+            outcome = "ok" if process.exit_status == 0 else "error"
+            return stdout.decode(encoding, errors="replace") if encoding else stdout
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        except (asyncssh.Error, OSError):
+            drop_ssh_connection(node)
+            raise
+        finally:
+            if process is not None and process.exit_status is None:
+                try:
+                    process.kill()
+                except (asyncssh.Error, OSError):
+                    pass
+                process.close()
+            record_command(f"{label}@{node['hostname']}", time.monotonic() - started, outcome)
+
+
+# Metagraph agent: a long-lived process on the chain node streaming snapshots
+METAGRAPH_AGENT_SCRIPT = Path(__file__).parent / "tools" / "metagraph_agent.py"
+METAGRAPH_AGENT_INTERVAL = 12  # seconds between snapshots (one block)
+METAGRAPH_AGENT_RESTART_DELAY = 10  # seconds before restarting a dead agent
+metagraph_agent_task: Optional[asyncio.Task] = None
+metagraph_agent_state: Dict[str, Optional[dict]] = {"metagraph": None, "subnet": None}
+metagraph_agent_ready: Dict[str, asyncio.Event] = {kind: asyncio.Event() for kind in metagraph_agent_state}
+
+# Signal pool miner log follower: incremental reads tracked by byte offset
+MINER_LOG_PATH = "~/signal_pool_miner.log"
+MINER_LOG_POLL_INTERVAL = 5  # seconds between incremental reads
+MINER_LOG_BOOTSTRAP_BYTES = 256 * 1024  # history read on first sync
+MINER_LOG_MAX_READ = 1024 * 1024  # bytes per poll; larger backlogs span several polls
+MINER_LOG_MAX_STRATEGIES = 9  # most recently reported strategies kept on the leaderboard
+STRATEGY_RESULT_RE = re.compile(r'(\w+): QUANTA=([-\d.]+), Sharpe=([-\d.]+), Return=([-\d.]+)%')
+WINNER_RE = re.compile(r'Signal pool winner: (\w+)')
+miner_log_task: Optional[asyncio.Task] = None
+miner_log_ready = asyncio.Event()  # set after the first successful poll
+miner_log_state: Dict = {
+    "file_id": None,  # inode + head checksum, identifies the file so rotation is detected
+    "offset": 0,  # bytes consumed so far
+    "results": {},  # strategy name -> latest parsed result
+    "leaderboard": [],  # ranked view of results, rebuilt when results change
+    "winner": None,
+}
 
 # Dashboard state
-dash_connections: List[WebSocket] = []
+dash_connections: Dict[WebSocket, asyncio.Queue] = {}  # socket -> pending outbound frames
+dash_producer_task: Optional[asyncio.Task] = None
+dash_snapshot: Dict = {}  # last snapshot published to WebSocket clients
+dash_snapshot_seq = 0  # version of dash_snapshot; patches move clients from seq-1 to seq
 dash_cache: Dict = {}
 dash_cache_time: Optional[datetime] = None
-DASH_CACHE_TTL = 10  # seconds
-
-
-async def check_node_health(node: dict) -> dict:
-    """Check health of a single node via SSH."""
-    health = {
+dash_refresh_task: Optional[asyncio.Task] = None  # in-flight refresh shared by all callers
+DASH_CACHE_TTL = 5  # seconds; assembled snapshot only, collectors have their own TTLs (DASH_SOURCES)
+DASH_STALE_TTL = 120  # seconds a stale snapshot may be served while refreshing
+DASH_PUSH_INTERVAL = 10  # seconds between broadcast refreshes
+DASH_SEND_QUEUE_SIZE = 4  # frames buffered per client before the oldest is dropped
+DASH_SEND_TIMEOUT = 10  # seconds before a stalled client is disconnected
+
+# Node health: kernel counters read in one round trip and parsed by section
+NODE_HEALTH_TIMEOUT = 10  # seconds
+PROC_HEALTH_COMMAND = (
+    "echo @stat; grep '^cpu' /proc/stat; "
+    "echo @meminfo; cat /proc/meminfo; "
+    "echo @loadavg; cat /proc/loadavg; "
+    "echo @uptime; cat /proc/uptime; "
+    "echo @statvfs; stat -f -c '%S %b %f %a' /"
+)
+node_cpu_counters: Dict[str, tuple] = {}  # hostname -> (total, idle) jiffies at the previous sample
+
+# Node probe scheduler: each node is probed on its own adaptive interval
+NODE_PROBE_CONCURRENCY = 8  # probes in flight at once
+NODE_PROBE_INTERVAL = 15  # seconds between probes of a healthy node (per-node "probe_interval" overrides)
+NODE_PROBE_FLAP_INTERVAL = 5  # seconds between probes of a node flapping online/offline
+NODE_PROBE_MAX_INTERVAL = 5 * 60  # cap on the backoff for an offline node
+NODE_PROBE_JITTER = 0.2  # +/- fraction applied to every interval so probes do not align
+NODE_CIRCUIT_THRESHOLD = 3  # consecutive failures before a node's circuit opens and probes back off
+NODE_FLAP_WINDOW = 10  # recent probe outcomes kept per node
+NODE_FLAP_THRESHOLD = 3  # online/offline changes within the window that count as flapping
+node_probe_task: Optional[asyncio.Task] = None
+node_probe_ready = asyncio.Event()  # set once every node has been probed
+node_probe_wakeup = asyncio.Event()  # set when a probe finishes and reschedules its node
+node_probe_state: Dict[str, dict] = {}  # hostname -> {health, failures, outcomes, next_probe}
+
+
+class NodeHealth(TypedDict):
+    name: str
+    hostname: str
+    ip: str
+    role: str
+    is_online: bool
+    cpu_usage: Optional[float]  # percent busy across all cores since the previous sample
+    cpu_cores: Optional[int]
+    load_average: Optional[List[float]]  # 1, 5 and 15 minute
+    memory_usage: Optional[float]  # percent of MemTotal not available
+    memory_total_mb: Optional[int]
+    disk_usage: Optional[float]  # percent of / used, as df reports it
+    uptime: Optional[str]
+    error: Optional[str]
+
+
+def is_local_node(node: dict) -> bool:
+    """True if the node is this machine and its /proc can be read directly."""
+    local = node.get("local") or node["hostname"] == socket.gethostname()
+    return bool(local) and os.path.exists("/proc/stat")
+
+
+def read_local_proc() -> str:
+    """Produce PROC_HEALTH_COMMAND output for this machine without a subprocess."""
+    with open("/proc/stat") as f:
+        cpu_lines = [line for line in f if line.startswith("cpu")]
+    vfs = os.statvfs("/")
+    return "".join([
+        "@stat\n", *cpu_lines,
+        "@meminfo\n", Path("/proc/meminfo").read_text(),
+        "@loadavg\n", Path("/proc/loadavg").read_text(),
+        "@uptime\n", Path("/proc/uptime").read_text(),
+        f"@statvfs\n{vfs.f_frsize} {vfs.f_blocks} {vfs.f_bfree} {vfs.f_bavail}\n",
+    ])
+
+
+def split_proc_sections(output: str) -> Dict[str, List[str]]:
+    """Split '@name' delimited output into non-empty lines per section."""
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith("@"):
+            current = sections.setdefault(line[1:].strip(), [])
+        elif current is not None and line.strip():
+            current.append(line)
+    return sections
+
+
+def format_uptime(seconds: float) -> str:
+    """Format seconds like `uptime -p` (two largest units)."""
+    minutes = int(seconds // 60)
+    parts = [(minutes // 1440, "day"), (minutes // 60 % 24, "hour"), (minutes % 60, "minute")]
+    parts = [f"{n} {unit}{'s' if n != 1 else ''}" for n, unit in parts if n]
+    return ", ".join(parts[:2]) or "0 minutes"
+
+
+def parse_proc_sample(hostname: str, output: str) -> dict:
+    """Turn PROC_HEALTH_COMMAND output into NodeHealth metrics.
+
+    CPU usage is the busy share of jiffies since the node's previous sample
+    (since boot on the first one).
+    """
+    sections = split_proc_sections(output)
+    metrics = {}
+
+    cpu_lines = sections.get("stat", [])
+    if cpu_lines:
+        fields = [int(v) for v in cpu_lines[0].split()[1:9]]  # user .. steal
+        total, idle = sum(fields), fields[3] + fields[4]  # idle + iowait
+        prev_total, prev_idle = node_cpu_counters.get(hostname, (0, 0))
+        if total < prev_total:  # counters reset by a reboot
+            prev_total, prev_idle = 0, 0
+        node_cpu_counters[hostname] = (total, idle)
+        if total > prev_total:
+            busy = (total - prev_total) - (idle - prev_idle)
+            metrics["cpu_usage"] = round(100 * busy / (total - prev_total), 1)
+        metrics["cpu_cores"] = len(cpu_lines) - 1
+
+    meminfo = {}
+    for line in sections.get("meminfo", []):
+        key, _, value = line.partition(":")
+        meminfo[key] = int(value.split()[0])
+    if meminfo.get("MemTotal"):
+        total = meminfo["MemTotal"]
+        available = meminfo.get("MemAvailable", meminfo.get("MemFree", 0) + meminfo.get("Buffers", 0) + meminfo.get("Cached", 0))
+        metrics["memory_usage"] = round(100 * (total - available) / total, 1)
+        metrics["memory_total_mb"] = total // 1024
+
+    if sections.get("loadavg"):
+        metrics["load_average"] = [float(v) for v in sections["loadavg"][0].split()[:3]]
+
+    if sections.get("uptime"):
+        metrics["uptime"] = format_uptime(float(sections["uptime"][0].split()[0]))
+
+    if sections.get("statvfs"):
+        _, blocks, free, available = (int(v) for v in sections["statvfs"][0].split())
+        used = blocks - free
+        if used + available:
+            metrics["disk_usage"] = round(100 * used / (used + available), 1)
+
+    return metrics
+
+
+def empty_node_health(node: dict, error: Optional[str] = None) -> NodeHealth:
+    """Return an offline NodeHealth record with no metrics."""
+    return {
         "name": node["name"],
         "hostname": node["hostname"],
         "ip": node["ip"],
         "role": node["role"],
         "is_online": False,
         "cpu_usage": None,
+        "cpu_cores": None,
+        "load_average": None,
         "memory_usage": None,
+        "memory_total_mb": None,
         "disk_usage": None,
         "uptime": None,
-        "error": None,
+        "error": error,
     }
 
+
+async def check_node_health(node: dict) -> NodeHealth:
+    """Sample a node's CPU, memory, load, uptime and disk in one round trip.
+
+    The host running this server is read directly; other nodes over their
+    pooled SSH connection.
+    """
+    health = empty_node_health(node)
     try:
-        cmd = f'ssh -o ConnectTimeout=5 -o BatchMode=yes {node["user"]}@{node["hostname"]} "' \
-              f'echo ONLINE && ' \
-              f'uptime -p && ' \
-              f'cat /proc/loadavg && ' \
-              f'free -m | grep Mem && ' \
-              f'df -h / | tail -1"'
-
-        result = await asyncio.create_subprocess_shell(
-            cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await asyncio.wait_for(result.communicate(), timeout=10)
-        output = stdout.decode().strip()
+        if is_local_node(node):
+            output = await asyncio.to_thread(read_local_proc)
+        else:
+            output = await run_remote(node, PROC_HEALTH_COMMAND, timeout=NODE_HEALTH_TIMEOUT, label="health")
 
-        if "ONLINE" in output:
+        metrics = parse_proc_sample(node["hostname"], output)
+        if metrics:
             health["is_online"] = True
-            lines = output.split("\n")
-
-            # Parse uptime
-            if len(lines) > 1:
-                health["uptime"] = lines[1].replace("up ", "")[:15]
-
-            # Parse CPU load (1 min average, 4 cores on Pi 5)
-            if len(lines) > 2:
-                load = lines[2].split()[0]
-                health["cpu_usage"] = min(float(load) * 100 / 4, 100)
-
-            # Parse memory
-            if len(lines) > 3:
-                mem_parts = lines[3].split()
-                if len(mem_parts) >= 3:
-                    total = float(mem_parts[1])
-                    used = float(mem_parts[2])
-                    health["memory_usage"] = (used / total) * 100
-
-            # Parse disk
-            if len(lines) > 4:
-                disk_parts = lines[4].split()
-                if len(disk_parts) >= 5:
-                    usage_str = disk_parts[4].replace("%", "")
-                    health["disk_usage"] = float(usage_str)
+            health.update(metrics)
+        else:
+            health["error"] = "No data from node"
 
     except asyncio.TimeoutError:
         health["error"] = "Connection timeout"
@@ -403,137 +1063,368 @@ async def check_node_health(node: dict) -> dict:
     return health
 
 
+def schedule_node_probe(node: dict, health: NodeHealth) -> float:
+    """Record a probe result and return the delay before the node's next probe.
+
+    Offline nodes back off exponentially once NODE_CIRCUIT_THRESHOLD probes
+    in a row have failed (circuit open) and recover on the next success;
+    nodes that keep changing state are probed faster.
+    """
+    state = node_probe_state[node["hostname"]]
+    online = health["is_online"]
+    state["health"] = health
+    state["outcomes"].append(online)
+
+    if online:
+        if state["failures"] >= NODE_CIRCUIT_THRESHOLD:
+            logger.info(f"Node {node['hostname']} is back online, closing circuit")
+        state["failures"] = 0
+    else:
+        state["failures"] += 1
+        if state["failures"] == NODE_CIRCUIT_THRESHOLD:
+            logger.warning(f"Node {node['hostname']} failed {NODE_CIRCUIT_THRESHOLD} probes, backing off")
+
+    outcomes = list(state["outcomes"])
+    flips = sum(1 for before, after in zip(outcomes, outcomes[1:]) if before != after)
+    if state["failures"] >= NODE_CIRCUIT_THRESHOLD:
+        backoff = 2 ** (state["failures"] - NODE_CIRCUIT_THRESHOLD + 1)
+        delay = min(NODE_PROBE_INTERVAL * backoff, NODE_PROBE_MAX_INTERVAL)
+    elif flips >= NODE_FLAP_THRESHOLD:
+        delay = NODE_PROBE_FLAP_INTERVAL
+    else:
+        delay = node.get("probe_interval", NODE_PROBE_INTERVAL)
+    return delay * random.uniform(1 - NODE_PROBE_JITTER, 1 + NODE_PROBE_JITTER)
+
+
+async def probe_node(node: dict, queue: list, semaphore: asyncio.Semaphore):
+    """Probe one node, then put it back on the schedule."""
+    try:
+        health = await check_node_health(node)
+        delay = schedule_node_probe(node, health)
+    except Exception as e:
+        logger.error(f"Probe of {node['hostname']} failed: {e}")
+        delay = NODE_PROBE_INTERVAL
+    finally:
+        semaphore.release()
+
+    heapq.heappush(queue, (time.monotonic() + delay, node["hostname"]))
+    if all(state["outcomes"] for state in node_probe_state.values()):
+        node_probe_ready.set()
+    node_probe_wakeup.set()
+
+
+async def node_prober():
+    """Probe every node on its own schedule with at most NODE_PROBE_CONCURRENCY in flight.
+
+    Due nodes come off a heap ordered by next probe time, so the loop only
+    wakes when a probe is due or one has just been rescheduled.
+    """
+    nodes = {node["hostname"]: node for node in CLUSTER_NODES}
+    for hostname, node in nodes.items():
+        node_probe_state[hostname] = {
+            "health": empty_node_health(node, "Not probed yet"),
+            "failures": 0,
+            "outcomes": deque(maxlen=NODE_FLAP_WINDOW),
+        }
+    if not nodes:
+        node_probe_ready.set()
+        return
+
+    semaphore = asyncio.Semaphore(NODE_PROBE_CONCURRENCY)
+    queue = [(time.monotonic(), hostname) for hostname in nodes]
+    heapq.heapify(queue)
+    probes = set()
+    try:
+        while True:
+            node_probe_wakeup.clear()
+            while queue and queue[0][0] <= time.monotonic():
+                await semaphore.acquire()
+                _, hostname = heapq.heappop(queue)
+                probe = asyncio.create_task(probe_node(nodes[hostname], queue, semaphore))
+                probes.add(probe)
+                probe.add_done_callback(probes.discard)
+
+            delay = queue[0][0] - time.monotonic() if queue else NODE_PROBE_MAX_INTERVAL
+            try:
+                await asyncio.wait_for(node_probe_wakeup.wait(), timeout=max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        for probe in probes:
+            probe.cancel()
+
+
+def ensure_node_prober():
+    """Start the node probe scheduler if it is not already running."""
+    global node_probe_task
+    if node_probe_task is None or node_probe_task.done():
+        node_probe_task = asyncio.create_task(node_prober())
+
+
 async def check_all_nodes() -> List[dict]:
-    """Check health of all configured nodes."""
-    tasks = [check_node_health(node) for node in CLUSTER_NODES]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    return [r for r in results if isinstance(r, dict)]
+    """Return the latest health of every configured node from the probe scheduler."""
+    try:
+        ensure_node_prober()
+        await asyncio.wait_for(node_probe_ready.wait(), timeout=10)
+    except asyncio.TimeoutError:
+        logger.warning("Not every node has been probed yet")
+    return [state["health"] for state in node_probe_state.values()]
 
 
 async def get_pm2_services() -> Dict[str, dict]:
-    """Get PM2 service status."""
+    """Get PM2 service status (raises if pm2 fails, so the last good map is kept)."""
+    # pm2 may print notices before the JSON document; only its line is kept
+    stdout = await run_command("pm2", ["pm2", "jlist"], timeout=5,
+                               keep_line=lambda line: line.lstrip().startswith(b"["))
+    json_line = next(iter(stdout.splitlines()), None)
+    if json_line is None:
+        raise RuntimeError("pm2 jlist printed no process list")
+
     services = {}
+    relevant = ["quanta-api", "quanta-agents", "quanta-monitor", "quanta-dashboard", "qsub-net"]
+    for proc in json.loads(json_line):
+        name = proc.get("name", "")
+        if name in relevant:
+            services[name] = {
+                "status": "online" if proc.get("pm2_env", {}).get("status") == "online" else "stopped",
+                "cpu": proc.get("monit", {}).get("cpu", 0),
+                "memory": proc.get("monit", {}).get("memory", 0),
+            }
+    return services
+
+
+async def run_metagraph_agent():
+    """Keep the remote metagraph agent running and consume its NDJSON stream.
+
+    The agent script is piped to the chain node's Python over the pooled SSH
+    connection, so nothing has to be deployed on the Pi. It is restarted after
+    METAGRAPH_AGENT_RESTART_DELAY if it exits or the connection drops.
+    """
+    cmd = f"source ~/quanta-venv/bin/activate && cd ~/quanta && python3 -u - --interval {METAGRAPH_AGENT_INTERVAL}"
+    while True:
+        try:
+            node = get_chain_node()
+            if node is None:
+                await asyncio.sleep(METAGRAPH_AGENT_RESTART_DELAY)
+                continue
+            conn = await get_ssh_connection(node)
+            async with conn.create_process(cmd) as process:
+                process.stdin.write(METAGRAPH_AGENT_SCRIPT.read_text())
+                process.stdin.write_eof()
+                logger.info(f"Metagraph agent started on {node['hostname']}")
+
+                async for line in process.stdout:
+                    handle_metagraph_agent_line(line)
+
+            logger.warning("Metagraph agent exited, restarting")
+            count_agent_failure("exited")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Metagraph agent failed: {e}")
+            count_agent_failure("error")
+        await asyncio.sleep(METAGRAPH_AGENT_RESTART_DELAY)
+
+
+def count_agent_failure(reason: str):
+    """Count a metagraph agent failure against both sources it feeds."""
+    for name in metagraph_agent_state:
+        dash_source_failures.inc(name, f"agent-{reason}")
+
+
+def handle_metagraph_agent_line(line: str):
+    """Store one snapshot from the agent stream (skipping warnings and noise)."""
+    line = line.strip()
+    if not line.startswith('{'):
+        return
     try:
-        result = await asyncio.create_subprocess_shell(
-            "pm2 jlist",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await asyncio.wait_for(result.communicate(), timeout=5)
-        pm2_list = json.loads(stdout.decode())
-
-        relevant = ["quanta-api", "quanta-agents", "quanta-monitor", "quanta-dashboard", "qsub-net"]
-        for proc in pm2_list:
-            name = proc.get("name", "")
-            if name in relevant:
-                services[name] = {
-                    "status": "online" if proc.get("pm2_env", {}).get("status") == "online" else "stopped",
-                    "cpu": proc.get("monit", {}).get("cpu", 0),
-                    "memory": proc.get("monit", {}).get("memory", 0),
-                }
-    except Exception as e:
-        logger.error(f"Failed to get PM2 status: {e}")
+        record = json.loads(line)
+    except ValueError:
+        return
+
+    kind = record.pop("type", None)
+    record.pop("timestamp", None)
+    if kind == "error":
+        logger.warning(f"Metagraph agent error: {record.get('message')}")
+        count_agent_failure("query")
+    elif kind in metagraph_agent_state:
+        metagraph_agent_state[kind] = record
+        metagraph_agent_ready[kind].set()
+
+
+def ensure_metagraph_agent():
+    """Start the metagraph agent task if it is not already running."""
+    global metagraph_agent_task
+    if metagraph_agent_task is None or metagraph_agent_task.done():
+        metagraph_agent_task = asyncio.create_task(run_metagraph_agent())
+
+
+async def stop_metagraph_agent():
+    """Cancel the metagraph agent task (closing its remote process)."""
+    if metagraph_agent_task is not None and not metagraph_agent_task.done():
+        metagraph_agent_task.cancel()
+        try:
+            await metagraph_agent_task
+        except asyncio.CancelledError:
+            pass
 
-    return services
+
+async def get_agent_snapshot(kind: str, timeout: float) -> dict:
+    """Return the agent's latest snapshot of a kind, waiting for the first one."""
+    if get_chain_node() is None:
+        return metagraph_agent_state[kind] or {}
+    ensure_metagraph_agent()
+    await asyncio.wait_for(metagraph_agent_ready[kind].wait(), timeout=timeout)
+    return metagraph_agent_state[kind]
 
 
 async def get_metagraph_data() -> Dict:
     """Get subnet metagraph data including UIDs and miners."""
-    metagraph = {"uids": [], "total": 0}
-    try:
-        # Use simpler inline Python command with proper escaping
-        python_code = "import bittensor as bt; import json; sub = bt.subtensor(network='local'); meta = sub.metagraph(netuid=1); uids = [{'uid': uid, 'hotkey': meta.hotkeys[uid][:16], 'stake': float(meta.S[uid].item()), 'axon_port': meta.axons[uid].port} for uid in range(meta.n.item())]; print(json.dumps({'uids': uids, 'total': meta.n.item()}))"
-        cmd = f'''ssh -o ConnectTimeout=5 -o BatchMode=yes jhirschfeld@rpi5 "source ~/quanta-venv/bin/activate && cd ~/quanta && python3 -c \\"{python_code}\\""'''
-
-        result = await asyncio.create_subprocess_shell(
-            cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await asyncio.wait_for(result.communicate(), timeout=15)
-        output = stdout.decode().strip()
+    return await get_agent_snapshot("metagraph", timeout=15) or {"uids": [], "total": 0}
+
+
+def parse_strategy_result(line: str) -> Optional[dict]:
+    """Parse a strategy result line from the signal pool miner log."""
+    if "signal_pool" not in line:
+        return None
+
+    # Parse: strategy_name: QUANTA=1.0674, Sharpe=0.7475, Return=1.58%
+    match = STRATEGY_RESULT_RE.search(line)
+    if not match:
+        return None
+
+    name = match.group(1)
+    quanta = float(match.group(2))
+    sharpe = float(match.group(3))
+    ret = float(match.group(4))
+    # Estimate drawdown from sharpe (simplified approximation)
+    drawdown = max(0, min(abs(ret * 0.5) if sharpe < 0 else abs(ret * 0.2), 15))
+    return {
+        "name": name,
+        "quanta_score": round(quanta, 4),
+        "sharpe": round(sharpe, 4),
+        "return_pct": round(ret, 2),
+        "drawdown_pct": round(drawdown, 2),
+    }
+
+
+def rank_strategies(results: Dict[str, dict]) -> List[Dict]:
+    """Build the ranked leaderboard from the latest result of each strategy."""
+    # Sort by QUANTA score descending
+    strategies = sorted((dict(r) for r in results.values()), key=lambda x: x["quanta_score"], reverse=True)
+
+    # Add rank and tier
+    for i, s in enumerate(strategies):
+        s["rank"] = i + 1
+        if s["quanta_score"] >= 2.0:
+            s["tier"] = "elite"
+        elif s["quanta_score"] >= 1.0:
+            s["tier"] = "profitable"
+        elif s["quanta_score"] >= 0:
+            s["tier"] = "neutral"
+        else:
+            s["tier"] = "underperforming"
+    return strategies
+
+
+async def poll_miner_log(node: dict):
+    """Read and parse only the bytes appended to the miner log since the last poll.
+
+    The remote side reports the log's identity (inode plus a checksum of its
+    first 64 bytes, since inodes get reused) and the offset it read from: a new
+    identity (rotation) or a size below our offset (truncation) restarts at 0. The
+    first sync only reads the last MINER_LOG_BOOTSTRAP_BYTES. Partial trailing
+    lines are left for the next poll.
+    """
+    state = miner_log_state
+    first_sync = state["file_id"] is None
+    cmd = (
+        f"f={MINER_LOG_PATH}; set -- $(stat -c '%i %s' $f 2>/dev/null || echo '0 0'); "
+        f"id=\"$1-$(head -c 64 $f 2>/dev/null | cksum | cut -d' ' -f1)\"; "
+        f"if [ {int(first_sync)} = 1 ]; then off=$(( $2 > {MINER_LOG_BOOTSTRAP_BYTES} ? $2 - {MINER_LOG_BOOTSTRAP_BYTES} : 0 )); "
+        f"elif [ \"$id\" != \"{state['file_id']}\" ] || [ $2 -lt {state['offset']} ]; then off=0; "
+        f"else off={state['offset']}; fi; "
+        f"echo \"$id $off\"; tail -c +$((off + 1)) $f 2>/dev/null | head -c {MINER_LOG_MAX_READ}"
+    )
+    output = await run_remote(node, cmd, timeout=10, encoding=None, label="miner-log")
+
+    header, _, body = output.partition(b"\n")
+    file_id, start = header.decode().split()
+    start = int(start)
+    if not first_sync and (file_id != state["file_id"] or start < state["offset"]):
+        logger.info("Miner log rotated or truncated, reading from the start")
+
+    # Skip the partial first line when bootstrapping from the middle of the file
+    skip = body.find(b"\n") + 1 if first_sync and start > 0 else 0
+    end = body.rfind(b"\n") + 1
+
+    changed = False
+    for line in body[skip:end].decode(errors="replace").splitlines():
+        result = parse_strategy_result(line)
+        if result:
+            # Re-insert so dict order tracks recency, keeping the latest round
+            state["results"].pop(result["name"], None)
+            state["results"][result["name"]] = result
+            if len(state["results"]) > MINER_LOG_MAX_STRATEGIES:
+                del state["results"][next(iter(state["results"]))]
+            changed = True
+            continue
+        match = WINNER_RE.search(line)
+        if match:
+            state["winner"] = {"name": match.group(1)}
+
+    if changed:
+        state["leaderboard"] = rank_strategies(state["results"])
+    state["file_id"] = file_id
+    state["offset"] = start + end
+
+
+async def follow_miner_log():
+    """Poll the signal pool miner log for new lines for as long as the server runs."""
+    while True:
+        try:
+            node = get_chain_node()
+            if node is not None:
+                await poll_miner_log(node)
+                miner_log_ready.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to follow miner log: {e}")
+            for name in ("strategies", "winner"):
+                dash_source_failures.inc(name, "miner-log")
+        await asyncio.sleep(MINER_LOG_POLL_INTERVAL)
 
-        # Find the JSON in the output (skip any warnings)
-        for line in output.split('\n'):
-            if line.strip().startswith('{'):
-                metagraph = json.loads(line.strip())
-                break
-    except asyncio.TimeoutError:
-        logger.warning("Metagraph query timed out")
-    except Exception as e:
-        logger.error(f"Failed to get metagraph: {e}")
-    return metagraph
+
+def ensure_miner_log_follower():
+    """Start the miner log follower task if it is not already running."""
+    global miner_log_task
+    if miner_log_task is None or miner_log_task.done():
+        miner_log_task = asyncio.create_task(follow_miner_log())
 
 
 async def get_strategy_leaderboard() -> List[Dict]:
     """Get the latest strategy competition results from signal pool miner log."""
-    strategies = []
+    if get_chain_node() is None:
+        return miner_log_state["leaderboard"]
     try:
-        cmd = '''ssh -o ConnectTimeout=5 -o BatchMode=yes jhirschfeld@rpi5 "tail -100 ~/signal_pool_miner.log 2>/dev/null | grep -E 'signal_pool.*QUANTA=' | tail -9"'''
-        result = await asyncio.create_subprocess_shell(
-            cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await asyncio.wait_for(result.communicate(), timeout=10)
-        lines = stdout.decode().strip().split('\n')
-
-        for line in lines:
-            # Parse: strategy_name: QUANTA=1.0674, Sharpe=0.7475, Return=1.58%
-            match = re.search(r'(\w+): QUANTA=([-\d.]+), Sharpe=([-\d.]+), Return=([-\d.]+)%', line)
-            if match:
-                name = match.group(1)
-                quanta = float(match.group(2))
-                sharpe = float(match.group(3))
-                ret = float(match.group(4))
-                # Estimate drawdown from sharpe (simplified approximation)
-                drawdown = max(0, min(abs(ret * 0.5) if sharpe < 0 else abs(ret * 0.2), 15))
-                strategies.append({
-                    "name": name,
-                    "quanta_score": round(quanta, 4),
-                    "sharpe": round(sharpe, 4),
-                    "return_pct": round(ret, 2),
-                    "drawdown_pct": round(drawdown, 2),
-                })
-
-        # Sort by QUANTA score descending
-        strategies.sort(key=lambda x: x["quanta_score"], reverse=True)
-
-        # Add rank and tier
-        for i, s in enumerate(strategies):
-            s["rank"] = i + 1
-            if s["quanta_score"] >= 2.0:
-                s["tier"] = "elite"
-            elif s["quanta_score"] >= 1.0:
-                s["tier"] = "profitable"
-            elif s["quanta_score"] >= 0:
-                s["tier"] = "neutral"
-            else:
-                s["tier"] = "underperforming"
-
-    except Exception as e:
-        logger.error(f"Failed to get strategy leaderboard: {e}")
-    return strategies
+        ensure_miner_log_follower()
+        await asyncio.wait_for(miner_log_ready.wait(), timeout=10)
+    except asyncio.TimeoutError:
+        logger.warning("Miner log not synced yet")
+    return miner_log_state["leaderboard"]
 
 
 async def get_winning_strategy() -> Optional[Dict]:
     """Get the current epoch's winning strategy."""
+    if get_chain_node() is None:
+        return miner_log_state["winner"]
     try:
-        cmd = '''ssh -o ConnectTimeout=5 -o BatchMode=yes jhirschfeld@rpi5 "tail -50 ~/signal_pool_miner.log 2>/dev/null | grep -E 'Signal pool winner:' | tail -1"'''
-        result = await asyncio.create_subprocess_shell(
-            cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await asyncio.wait_for(result.communicate(), timeout=10)
-        line = stdout.decode().strip()
-
-        match = re.search(r'Signal pool winner: (\w+)', line)
-        if match:
-            return {"name": match.group(1)}
-    except Exception as e:
-        logger.error(f"Failed to get winning strategy: {e}")
-    return None
+        ensure_miner_log_follower()
+        await asyncio.wait_for(miner_log_ready.wait(), timeout=10)
+    except asyncio.TimeoutError:
+        logger.warning("Miner log not synced yet")
+    return miner_log_state["winner"]
 
 
 async def get_subnet_info() -> Dict:
@@ -546,47 +1437,134 @@ async def get_subnet_info() -> Dict:
         "tempo": 0,
         "registration_cost": 0.0005,
     }
-    try:
-        # Query subnet info via btcli
-        python_code = "import bittensor as bt; import json; sub = bt.subtensor(network='local'); info = sub.get_subnet_info(netuid=1); print(json.dumps({'tao_pool': float(info.tao_in) if hasattr(info, 'tao_in') else 10.0, 'alpha_pool': float(info.alpha_in) if hasattr(info, 'alpha_in') else 10.0, 'emission': float(info.emission_value) if hasattr(info, 'emission_value') else 0.0, 'tempo': int(info.tempo) if hasattr(info, 'tempo') else 100}))"
-        cmd = f'''ssh -o ConnectTimeout=5 -o BatchMode=yes jhirschfeld@rpi5 "source ~/quanta-venv/bin/activate && python3 -c \\"{python_code}\\"" 2>/dev/null'''
-
-        result = await asyncio.create_subprocess_shell(
-            cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await asyncio.wait_for(result.communicate(), timeout=15)
-        output = stdout.decode().strip()
+    subnet_info.update(await get_agent_snapshot("subnet", timeout=15))
+    return subnet_info
 
-        for line in output.split('\n'):
-            if line.strip().startswith('{'):
-                data = json.loads(line.strip())
-                subnet_info.update(data)
-                break
+
+# Per-collector cache policy: how long a result stays fresh, a hard timeout
+# for one refresh, and the value to use until the first refresh succeeds.
+# Collectors raise on failure rather than returning a default, so a failed
+# refresh never replaces the last good value.
+DASH_SOURCES = {
+    "nodes": {"fetch": check_all_nodes, "ttl": 5, "timeout": 12, "default": []},
+    "services": {"fetch": get_pm2_services, "ttl": 10, "timeout": 6, "default": {}},
+    "metagraph": {"fetch": get_metagraph_data, "ttl": METAGRAPH_AGENT_INTERVAL, "timeout": 20, "default": {"uids": [], "total": 0}},
+    "strategies": {"fetch": get_strategy_leaderboard, "ttl": MINER_LOG_POLL_INTERVAL, "timeout": 12, "default": []},
+    "winner": {"fetch": get_winning_strategy, "ttl": MINER_LOG_POLL_INTERVAL, "timeout": 12, "default": None},
+    "subnet": {"fetch": get_subnet_info, "ttl": METAGRAPH_AGENT_INTERVAL, "timeout": 20, "default": {}},
+}
+
+# Per-collector state: last good value, when it was fetched, when a refresh
+# last failed, in-flight refresh
+dash_source_state: Dict[str, dict] = {
+    name: {"value": source["default"], "updated": None, "failed_at": None, "task": None}
+    for name, source in DASH_SOURCES.items()
+}
+
+
+async def refresh_dash_source(name: str):
+    """Run one collector, keeping its last good value on timeout or failure."""
+    source = DASH_SOURCES[name]
+    state = dash_source_state[name]
+    started = time.perf_counter()
+    try:
+        state["value"] = await asyncio.wait_for(source["fetch"](), timeout=source["timeout"])
+        state["updated"] = datetime.now()
+    except asyncio.TimeoutError:
+        state["failed_at"] = datetime.now()
+        dash_source_failures.inc(name, "timeout")
+        logger.warning(f"Dashboard source '{name}' timed out after {source['timeout']}s")
     except Exception as e:
-        logger.error(f"Failed to get subnet info: {e}")
-    return subnet_info
+        state["failed_at"] = datetime.now()
+        dash_source_failures.inc(name, "error")
+        logger.error(f"Dashboard source '{name}' failed: {e}")
+    finally:
+        dash_source_duration.observe(time.perf_counter() - started, name)
 
 
-async def gather_dash_status() -> dict:
-    """Gather all dashboard status data."""
-    global dash_cache, dash_cache_time
+async def get_dash_source(name: str):
+    """Return a collector's freshest available value without waiting on a refresh.
+
+    Expired entries are refreshed in the background (one refresh per source at
+    a time, and at most once per ttl after a failure). Only a source's very
+    first attempt is awaited, bounded by its timeout; if that fails, callers
+    get the default while the background refresh keeps retrying.
+    """
+    state = dash_source_state[name]
+    ttl = DASH_SOURCES[name]["ttl"]
+    now = datetime.now()
+    updated, failed_at = state["updated"], state["failed_at"]
+    if updated and (now - updated).total_seconds() < ttl:
+        return state["value"]
+
+    retry_due = failed_at is None or (updated and failed_at < updated) or (now - failed_at).total_seconds() >= ttl
+    if retry_due and (state["task"] is None or state["task"].done()):
+        state["task"] = asyncio.create_task(refresh_dash_source(name))
+    if updated is None and failed_at is None:
+        await asyncio.shield(state["task"])
+    return state["value"]
+
+
+class DashUnavailable(Exception):
+    """No dashboard snapshot is available yet (follower waiting on the leader)."""
+
+
+async def gather_dash_status(allow_stale: bool = True) -> dict:
+    """Gather all dashboard status data.
+
+    Concurrent cache misses share a single in-flight refresh. While a refresh
+    runs, callers get the last snapshot immediately if it is younger than
+    DASH_STALE_TTL (unless allow_stale is False).
+    """
+    if worker_role == "follower":
+        # Snapshots are pushed by the leader; wait briefly for the first one after startup
+        if not worker_snapshot_ready.is_set():
+            try:
+                await asyncio.wait_for(worker_snapshot_ready.wait(), timeout=WORKER_SNAPSHOT_WAIT)
+            except asyncio.TimeoutError:
+                raise DashUnavailable("No dashboard snapshot from the leader yet") from None
+        dash_cache_requests.inc("hit")
+        return dash_cache
+
+    age = (datetime.now() - dash_cache_time).total_seconds() if dash_cache_time else None
 
     # Check cache
-    if dash_cache_time and (datetime.now() - dash_cache_time).seconds < DASH_CACHE_TTL:
+    if age is not None and age < DASH_CACHE_TTL:
+        dash_cache_requests.inc("hit")
+        return dash_cache
+
+    refresh = start_dash_refresh()
+    if allow_stale and age is not None and age < DASH_STALE_TTL:
+        dash_cache_requests.inc("stale")
         return dash_cache
 
-    # Gather all data in parallel
-    nodes_task = check_all_nodes()
-    services_task = get_pm2_services()
-    metagraph_task = get_metagraph_data()
-    strategies_task = get_strategy_leaderboard()
-    winner_task = get_winning_strategy()
-    subnet_task = get_subnet_info()
+    dash_cache_requests.inc("miss")
+    # Shield so a disconnecting caller does not cancel the shared refresh
+    return await asyncio.shield(refresh)
+
+
+def start_dash_refresh() -> asyncio.Task:
+    """Start a dashboard refresh unless one is already in flight."""
+    global dash_refresh_task
+    if dash_refresh_task is None or dash_refresh_task.done():
+        dash_refresh_task = asyncio.create_task(refresh_dash_status())
+        dash_refresh_task.add_done_callback(log_dash_refresh_error)
+    return dash_refresh_task
+
+
+def log_dash_refresh_error(task: asyncio.Task):
+    """Log failures of refreshes nobody awaited (stale-while-revalidate)."""
+    if not task.cancelled() and task.exception():
+        logger.error(f"Dashboard refresh failed: {task.exception()}")
+
+
+async def refresh_dash_status() -> dict:
+    """Assemble a dashboard snapshot from the per-collector caches."""
+    global dash_cache, dash_cache_time
 
+    # Gather all data in parallel; each source answers from its own cache
     nodes, services, metagraph, strategies, winner, subnet_info = await asyncio.gather(
-        nodes_task, services_task, metagraph_task, strategies_task, winner_task, subnet_task
+        *(get_dash_source(name) for name in DASH_SOURCES)
     )
 
     # Calculate epoch progress (mock for now - replace with actual btcli query)
@@ -637,112 +1615,1261 @@ async def gather_dash_status() -> dict:
             {"type": "commit", "title": "Node Online", "meta": "rpi5 localnet node connected", "time": "Just now"},
         ],
         "timestamp": now.isoformat(),
+        # When each collector last succeeded (None until its first success)
+        "sources_updated": {
+            name: state["updated"].isoformat() if state["updated"] else None
+            for name, state in dash_source_state.items()
+        },
     }
 
     dash_cache = status
     dash_cache_time = datetime.now()
+    broadcast_to_followers({"type": "snapshot", "data": status})
 
     return status
 
 
-# Dashboard API endpoints
+# =============================================================================
+# DASHBOARD HISTORY
+# =============================================================================
 
-@app.get("/api/dash/status")
-async def get_dash_status():
-    """Get dashboard status via REST."""
-    return await gather_dash_status()
+# Time-series history of dashboard metrics: in-memory ring buffers flushed to
+# append-only binary files (interleaved float64 timestamp/value pairs)
+HISTORY_DIR = Path("data/dash/history")
+HISTORY_SAMPLE_INTERVAL = 10  # seconds between samples
+HISTORY_RETENTION = 24 * 60 * 60  # seconds of history kept in memory
+HISTORY_CAPACITY = HISTORY_RETENTION // HISTORY_SAMPLE_INTERVAL  # samples per series
+HISTORY_FLUSH_INTERVAL = 60  # seconds between flushes to disk
+HISTORY_MAX_POINTS = 1000  # upper bound on points returned per series
 
 
-@app.websocket("/ws/dash")
-async def dash_websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time dashboard updates."""
-    await websocket.accept()
-    dash_connections.append(websocket)
-    logger.info(f"Dashboard WebSocket connected. Total: {len(dash_connections)}")
+class MetricSeries:
+    """Ring buffer of samples stored in two float64 columns.
 
-    try:
-        # Send initial status
-        status = await gather_dash_status()
-        await websocket.send_json(status)
+    The columns grow as samples arrive and only wrap once they reach capacity,
+    so short-lived series stay small.
+    """
 
-        while True:
-            data = await websocket.receive_json()
-            if data.get("type") == "refresh":
-                status = await gather_dash_status()
-                await websocket.send_json(status)
+    def __init__(self, capacity: int = HISTORY_CAPACITY):
+        self.capacity = capacity
+        self.times = array("d")
+        self.values = array("d")
+        self.head = 0  # next slot to write
+        self.count = 0
+        self.unflushed = 0
+
+    def append(self, timestamp: float, value: float):
+        if self.count < self.capacity:
+            self.times.append(timestamp)
+            self.values.append(value)
+            self.count += 1
+        else:
+            self.times[self.head] = timestamp
+            self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.unflushed = min(self.unflushed + 1, self.capacity)
 
-    except WebSocketDisconnect:
-        if websocket in dash_connections:
-            dash_connections.remove(websocket)
-        logger.info(f"Dashboard WebSocket disconnected. Total: {len(dash_connections)}")
-    except Exception as e:
-        logger.error(f"Dashboard WebSocket error: {e}")
-        if websocket in dash_connections:
-            dash_connections.remove(websocket)
+    def samples(self, last: Optional[int] = None):
+        """Yield (timestamp, value) pairs oldest first, optionally only the last N."""
+        n = self.count if last is None else min(last, self.count)
+        for i in range(self.head - n, self.head):
+            yield self.times[i % self.capacity], self.values[i % self.capacity]
 
+    def latest(self) -> float:
+        """Timestamp of the newest sample (0 if empty)."""
+        return self.times[(self.head - 1) % self.capacity] if self.count else 0.0
 
-# =============================================================================
-# APPLICATION API Endpoints
-# =============================================================================
+    def take_unflushed(self) -> array:
+        """Return samples not yet written to disk as interleaved pairs."""
+        pending = array("d")
+        for timestamp, value in self.samples(self.unflushed):
+            pending.append(timestamp)
+            pending.append(value)
+        self.unflushed = 0
+        return pending
 
-@app.post("/api/upload")
-async def upload_file(file: UploadFile = File(...)):
-    """Handle resume file uploads."""
+
+dash_history: Dict[str, MetricSeries] = {}
+
+
+def metric_name(*parts) -> str:
+    """Build a dotted metric name that is also a safe file name."""
+    return ".".join(re.sub(r"[^\w-]", "_", str(part)) for part in parts)
+
+
+def record_dash_history(status: dict, timestamp: Optional[float] = None):
+    """Append the numeric metrics of a dashboard snapshot to the history.
+
+    Sources that have not succeeded yet are skipped, so their placeholder
+    defaults never enter the history.
+    """
+    timestamp = timestamp or time.time()
+    samples = {}
+    updated = status.get("sources_updated")
+
+    def succeeded(source: str) -> bool:
+        return updated is None or updated.get(source) is not None
+
+    for node in status.get("nodes", []) if succeeded("nodes") else []:
+        for key in ("cpu_usage", "memory_usage", "disk_usage"):
+            if node.get(key) is not None:
+                samples[metric_name("node", node["hostname"], key)] = node[key]
+
+    for name, service in status.get("services", {}).items() if succeeded("services") else []:
+        samples[metric_name("service", name, "cpu")] = service.get("cpu", 0)
+        samples[metric_name("service", name, "memory")] = service.get("memory", 0)
+
+    if succeeded("metagraph"):
+        uids = status.get("metagraph", {}).get("uids", [])
+        samples["metagraph.total_stake"] = sum(u.get("stake", 0) for u in uids)
+        samples["metagraph.total_uids"] = status.get("metagraph", {}).get("total", 0)
+
+    for strategy in status.get("strategies", []) if succeeded("strategies") else []:
+        samples[metric_name("strategy", strategy["name"], "quanta_score")] = strategy["quanta_score"]
+
+    for name, value in samples.items():
+        series = dash_history.get(name)
+        if series is None:
+            series = dash_history[name] = MetricSeries()
+        series.append(timestamp, float(value))
+
+    # Drop series (retired strategies, removed nodes) with nothing left in the window
+    cutoff = timestamp - HISTORY_RETENTION
+    for name in [name for name, series in dash_history.items() if series.latest() < cutoff]:
+        del dash_history[name]
+
+
+def downsample(series: MetricSeries, start: float, end: float, step: float) -> List[dict]:
+    """Roll samples in [start, end] up into step-sized avg/min/max buckets."""
+    buckets: Dict[int, list] = {}
+    for timestamp, value in series.samples():
+        if start <= timestamp <= end:
+            index = int((timestamp - start) // step)
+            bucket = buckets.get(index)
+            if bucket is None:
+                buckets[index] = [value, value, value, 1]
+            else:
+                bucket[0] += value
+                bucket[1] = min(bucket[1], value)
+                bucket[2] = max(bucket[2], value)
+                bucket[3] += 1
+
+    return [
+        {
+            "t": round(start + index * step),
+            "avg": round(total / count, 4),
+            "min": round(low, 4),
+            "max": round(high, 4),
+        }
+        for index, (total, low, high, count) in sorted(buckets.items())
+    ]
+
+
+def read_history_files() -> Dict[str, array]:
+    """Read persisted series, keeping samples within the retention window."""
+    cutoff = time.time() - HISTORY_RETENTION
+    loaded = {}
+    for path in HISTORY_DIR.glob("*.bin"):
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = array("d")
+        data.frombytes(raw[:len(raw) - len(raw) % 16])  # Drop a torn trailing write
+
+        # Samples are appended in time order, so expired ones are at the head
+        start = max(0, len(data) - 2 * HISTORY_CAPACITY)
+        while start < len(data) and data[start] < cutoff:
+            start += 2
+        loaded[path.stem] = data[start:]
+    return loaded
+
+
+def remove_stale_history_files():
+    """Delete the files of pruned series once they hold nothing within the retention."""
+    cutoff = time.time() - HISTORY_RETENTION
+    for path in HISTORY_DIR.glob("*.bin"):
+        if path.stem not in dash_history and path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            logger.info(f"Removed stale history series {path.stem}")
+
+
+def write_history_files(pending: Dict[str, array]):
+    """Append new samples to disk, compacting files that outgrow the retention."""
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    for name, data in pending.items():
+        path = HISTORY_DIR / f"{name}.bin"
+        with open(path, "ab") as f:
+            data.tofile(f)
+
+        if path.stat().st_size > 2 * 16 * HISTORY_CAPACITY:
+            kept = array("d")
+            with open(path, "rb") as f:
+                kept.frombytes(f.read())
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                kept[-2 * HISTORY_CAPACITY:].tofile(f)
+            os.replace(tmp_path, path)
+
+
+async def load_dash_history():
+    """Restore the in-memory history from disk."""
     try:
-        # Validate file extension
-        ext = Path(file.filename).suffix.lower()
-        if ext not in ALLOWED_EXTENSIONS:
-            return JSONResponse(
-                status_code=400,
-                content={"error": f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"}
-            )
+        loaded = await asyncio.to_thread(read_history_files)
+    except Exception as e:
+        logger.error(f"Failed to load dashboard history: {e}")
+        return
+
+    for name, data in loaded.items():
+        if not data:
+            continue  # Entirely expired; its file is removed on the next flush
+        series = dash_history[name] = MetricSeries()
+        for i in range(0, len(data) - 1, 2):
+            series.append(data[i], data[i + 1])
+        series.unflushed = 0
+    logger.info(f"Loaded dashboard history: {len(dash_history)} series")
+
+
+async def flush_dash_history():
+    """Write samples recorded since the last flush to disk."""
+    pending = {name: series.take_unflushed() for name, series in dash_history.items()}
+    pending = {name: data for name, data in pending.items() if data}
+    try:
+        if pending:
+            await asyncio.to_thread(write_history_files, pending)
+        await asyncio.to_thread(remove_stale_history_files)
+    except Exception as e:
+        logger.error(f"Failed to flush dashboard history: {e}")
 
-        # Read file content
-        content = await file.read()
 
-        # Validate file size
-        if len(content) > MAX_FILE_SIZE:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "File size exceeds 10MB limit"}
+async def history_sampler():
+    """Sample the dashboard on a fixed interval, whether or not anyone is watching."""
+    while True:
+        try:
+            record_dash_history(await gather_dash_status(allow_stale=False))
+            broadcast_to_followers({"type": "sample"})
+        except Exception as e:
+            logger.error(f"Dashboard history sample failed: {e}")
+        await asyncio.sleep(HISTORY_SAMPLE_INTERVAL)
+
+
+async def history_flusher():
+    """Periodically persist the history."""
+    while True:
+        await asyncio.sleep(HISTORY_FLUSH_INTERVAL)
+        await flush_dash_history()
+
+
+# Dashboard API endpoints
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics in text exposition format.
+
+    With several workers every worker answers with the same merged exposition
+    (one worker label per process), assembled by the leader.
+    """
+    if SERVER_WORKERS <= 1:
+        content = render_metrics()
+    elif worker_role == "leader":
+        content = cluster_metrics_text()
+    elif worker_metrics_text is not None:
+        content = worker_metrics_text
+    else:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "No metrics from the leader yet"},
+            headers={"Retry-After": str(WORKER_METRICS_INTERVAL)}
+        )
+    return Response(content=content, media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/dash/status")
+async def get_dash_status():
+    """Get dashboard status via REST."""
+    try:
+        return await gather_dash_status()
+    except DashUnavailable as e:
+        return JSONResponse(
+            status_code=503,
+            content={"error": str(e)},
+            headers={"Retry-After": str(WORKER_IPC_RETRY)}
+        )
+
+
+def json_pointer_token(key) -> str:
+    """Escape a dict key for use as a JSON pointer segment."""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def diff_dash_status(old, new, path: str = "") -> List[dict]:
+    """Compute JSON-patch style operations (RFC 6902 subset) turning old into new."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            child = f"{path}/{json_pointer_token(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff_dash_status(old[key], value, child))
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{json_pointer_token(key)}"})
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        ops = []
+        common = min(len(old), len(new))
+        for i in range(common):
+            ops.extend(diff_dash_status(old[i], new[i], f"{path}/{i}"))
+        for i in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        # Remove from the tail so earlier indexes stay valid while applying
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        return ops
+
+    if type(old) is not type(new) or old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def full_dash_frame() -> str:
+    """Serialize the current snapshot as a full frame for (re)syncing a client."""
+    return json.dumps({"type": "full", "seq": dash_snapshot_seq, "data": dash_snapshot})
+
+
+@app.get("/api/dash/history")
+async def get_dash_history(metric: Optional[str] = None, minutes: int = 60, points: int = 360):
+    """Get downsampled metric history.
+
+    Without `metric`, lists the available series. `metric` may be a
+    comma-separated list; each series is rolled up into at most `points`
+    avg/min/max buckets over the last `minutes`.
+    """
+    if not metric:
+        return {"metrics": sorted(dash_history)}
+
+    end = time.time()
+    start = end - max(1, min(minutes, HISTORY_RETENTION // 60)) * 60
+    step = max(HISTORY_SAMPLE_INTERVAL, (end - start) / max(1, min(points, HISTORY_MAX_POINTS)))
+
+    series = {}
+    for name in metric.split(","):
+        if name in dash_history:
+            series[name] = downsample(dash_history[name], start, end, step)
+
+    if not series:
+        return JSONResponse(status_code=404, content={"error": "Unknown metric"})
+    return {"start": round(start), "end": round(end), "step": step, "series": series}
+
+
+def enqueue_dash_frame(queue: asyncio.Queue, frame: str):
+    """Queue a frame for one client.
+
+    If the client has fallen behind and its queue is full, the pending patches
+    are discarded and replaced by a single full frame so it catches up in one
+    message instead of replaying stale diffs.
+    """
+    if queue.full():
+        ws_queue_overflows.inc()
+        while not queue.empty():
+            queue.get_nowait()
+        frame = full_dash_frame()
+    queue.put_nowait(frame)
+
+
+def publish_dash_snapshot(status: dict):
+    """Record a new snapshot and broadcast the diff from the previous one."""
+    global dash_snapshot, dash_snapshot_seq
+
+    if status is dash_snapshot:
+        return  # Served from cache, nothing changed
+
+    ops = diff_dash_status(dash_snapshot, status)
+    dash_snapshot = status
+    if not ops:
+        return
+
+    dash_snapshot_seq += 1
+    frame = json.dumps({
+        "type": "patch",
+        "seq": dash_snapshot_seq,
+        "base": dash_snapshot_seq - 1,
+        "ops": ops,
+    })
+    for queue in dash_connections.values():
+        enqueue_dash_frame(queue, frame)
+
+
+async def dash_producer():
+    """Refresh the dashboard snapshot on a schedule and push it to all clients.
+
+    Runs only while at least one dashboard is connected, so the cluster is not
+    polled when nobody is watching.
+    """
+    while dash_connections:
+        try:
+            publish_dash_snapshot(await gather_dash_status(allow_stale=False))
+        except Exception as e:
+            logger.error(f"Dashboard producer error: {e}")
+        await asyncio.sleep(DASH_PUSH_INTERVAL)
+
+
+def ensure_dash_producer():
+    """Start the broadcast producer if it is not already running."""
+    global dash_producer_task
+    if worker_role == "follower":
+        return  # Snapshots arrive from the leader and are published as they come in
+    if dash_producer_task is None or dash_producer_task.done():
+        dash_producer_task = asyncio.create_task(dash_producer())
+
+
+async def dash_sender(websocket: WebSocket, queue: asyncio.Queue):
+    """Drain a client's send queue; a stalled client only blocks itself."""
+    while True:
+        frame = await queue.get()
+        await asyncio.wait_for(websocket.send_text(frame), timeout=DASH_SEND_TIMEOUT)
+
+
+async def dash_receiver(websocket: WebSocket, queue: asyncio.Queue):
+    """Handle client messages (manual refresh and resync requests)."""
+    while True:
+        data = await websocket.receive_json()
+        if data.get("type") == "refresh":
+            if worker_role == "follower":
+                notify_leader({"type": "refresh"})  # The result arrives as a snapshot
+            else:
+                publish_dash_snapshot(await gather_dash_status())
+        elif data.get("type") == "resync":
+            enqueue_dash_frame(queue, full_dash_frame())
+
+
+@app.websocket("/ws/dash")
+async def dash_websocket_endpoint(websocket: WebSocket):
+    """WebSocket endpoint for real-time dashboard updates."""
+    await websocket.accept()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=DASH_SEND_QUEUE_SIZE)
+    tasks: List[asyncio.Task] = []
+
+    try:
+        # Send initial status as a full frame; patches follow from its seq.
+        # The client is registered afterwards so it never sees an older patch.
+        publish_dash_snapshot(await gather_dash_status())
+        enqueue_dash_frame(queue, full_dash_frame())
+        dash_connections[websocket] = queue
+        ensure_dash_producer()
+        logger.info(f"Dashboard WebSocket connected. Total: {len(dash_connections)}")
+
+        tasks = [
+            asyncio.create_task(dash_sender(websocket, queue)),
+            asyncio.create_task(dash_receiver(websocket, queue)),
+        ]
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error and not isinstance(error, WebSocketDisconnect):
+                raise error
+
+    except WebSocketDisconnect:
+        pass
+    except DashUnavailable as e:
+        logger.warning(f"Dashboard WebSocket refused: {e}")
+        await websocket.close(code=1013)  # Try again later
+    except asyncio.TimeoutError:
+        logger.warning("Dashboard WebSocket send timed out, dropping client")
+    except Exception as e:
+        logger.error(f"Dashboard WebSocket error: {e}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        dash_connections.pop(websocket, None)
+        try:
+            await websocket.close()
+        except Exception:
+            pass  # Already closed by the client
+        logger.info(f"Dashboard WebSocket disconnected. Total: {len(dash_connections)}")
+
+
+# =============================================================================
+# APPLICATION STORAGE
+# =============================================================================
+
+APP_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    submitted_at TEXT NOT NULL,
+    ip TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_applications_email ON applications (email);
+CREATE INDEX IF NOT EXISTS idx_applications_submitted_at ON applications (submitted_at);
+
+CREATE TABLE IF NOT EXISTS application_areas (
+    application_id INTEGER NOT NULL REFERENCES applications (id),
+    area TEXT NOT NULL,
+    PRIMARY KEY (area, application_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending, sending, sent, dead
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    sent_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (status, next_attempt_at);
+
+CREATE TABLE IF NOT EXISTS uploaded_files (
+    file_id TEXT PRIMARY KEY,
+    original_name TEXT NOT NULL,
+    saved_name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    uploaded_at TEXT NOT NULL
+);
+
+-- Upload contents stored once per SHA-256 digest, shared by uploaded_files rows
+CREATE TABLE IF NOT EXISTS upload_blobs (
+    digest TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    ref_count INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+# Columns added after a table was first created: (table, column, definition)
+APP_DB_MIGRATIONS = [
+    ("uploaded_files", "digest", "TEXT"),
+    ("uploaded_files", "attached", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+app_db_write_conn: Optional[sqlite3.Connection] = None
+app_db_read_conn: Optional[sqlite3.Connection] = None
+app_db_queue: Optional[asyncio.Queue] = None  # pending (write_fn, future) pairs
+app_db_writer_task: Optional[asyncio.Task] = None
+
+
+@contextmanager
+def write_transaction(conn: sqlite3.Connection):
+    """Run a block in one transaction that holds the database write lock from the start.
+
+    BEGIN IMMEDIATE makes read-then-write logic atomic across processes, so
+    every worker's writer (and the leader's upload GC) is serialized.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def open_app_db() -> sqlite3.Connection:
+    """Open a connection to the application database, creating the schema.
+
+    Connections are in autocommit mode; writes use write_transaction.
+    """
+    APP_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(APP_DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(APP_DB_SCHEMA)
+    # Every worker migrates at startup; the write lock makes the column check and ALTER atomic
+    with write_transaction(conn):
+        for table, column, definition in APP_DB_MIGRATIONS:
+            if column not in {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_uploaded_files_orphans ON uploaded_files (attached, uploaded_at)")
+    return conn
+
+
+def get_app_db() -> sqlite3.Connection:
+    """Return the shared read connection (WAL lets it read while the writer commits)."""
+    global app_db_read_conn, app_db_write_conn
+    if app_db_read_conn is None:
+        app_db_write_conn = open_app_db()
+        app_db_read_conn = open_app_db()
+    return app_db_read_conn
+
+
+def commit_app_db_batch(batch: list) -> list:
+    """Run a batch of write functions in one transaction.
+
+    If the batch fails, each write is retried in its own transaction so one
+    bad row does not fail the others. Returns a result or exception per write.
+    """
+    conn = app_db_write_conn
+    try:
+        with write_transaction(conn):
+            return [write(conn) for write, _ in batch]
+    except Exception:
+        results = []
+        for write, _ in batch:
+            try:
+                with write_transaction(conn):
+                    results.append(write(conn))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+async def app_db_writer():
+    """Collect queued writes into batches and commit them off the event loop.
+
+    A None item stops the writer after everything queued before it is committed.
+    """
+    stopping = False
+    while not stopping:
+        item = await app_db_queue.get()
+        if item is None:
+            return
+        batch = [item]
+        deadline = asyncio.get_running_loop().time() + APP_DB_BATCH_DELAY
+        while len(batch) < APP_DB_BATCH_SIZE:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(app_db_queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                stopping = True  # Commit what we have, then exit
+                break
+            batch.append(item)
+
+        try:
+            results = await asyncio.to_thread(commit_app_db_batch, batch)
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+async def app_db_write(write):
+    """Queue a write function for the next batch and wait until it is committed."""
+    global app_db_queue, app_db_writer_task
+    get_app_db()
+    if app_db_writer_task is None or app_db_writer_task.done():
+        app_db_queue = asyncio.Queue()
+        app_db_writer_task = asyncio.create_task(app_db_writer())
+
+    future = asyncio.get_running_loop().create_future()
+    await app_db_queue.put((write, future))
+    return await future
+
+
+async def app_db_read(query: str, params: tuple = ()) -> List[sqlite3.Row]:
+    """Run a read query off the event loop."""
+    conn = get_app_db()
+    return await asyncio.to_thread(lambda: conn.execute(query, params).fetchall())
+
+
+async def close_app_db():
+    """Stop the writer once queued writes are committed and close connections."""
+    global app_db_read_conn, app_db_write_conn, app_db_writer_task
+    if app_db_writer_task is not None and not app_db_writer_task.done():
+        await app_db_queue.put(None)
+        await app_db_writer_task
+    app_db_writer_task = None
+    for conn in (app_db_read_conn, app_db_write_conn):
+        if conn is not None:
+            conn.close()
+    app_db_read_conn = app_db_write_conn = None
+
+
+async def save_application(data: dict) -> int:
+    """Persist an application and its areas; returns the application id."""
+    def write(conn: sqlite3.Connection) -> int:
+        cursor = conn.execute(
+            "INSERT INTO applications (name, email, submitted_at, ip, data) VALUES (?, ?, ?, ?, ?)",
+            (data['name'], data['email'].strip().lower(), data['submitted_at'], data.get('ip'), json.dumps(data)),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO application_areas (application_id, area) VALUES (?, ?)",
+            [(cursor.lastrowid, area) for area in data.get('areas', [])],
+        )
+        if data.get('resume_file_id'):
+            # Attached uploads are exempt from orphan collection
+            conn.execute("UPDATE uploaded_files SET attached = 1 WHERE file_id = ?", (data['resume_file_id'],))
+        return cursor.lastrowid
+
+    return await app_db_write(write)
+
+
+async def save_uploaded_file(file_id: str, upload: dict) -> dict:
+    """Store a received upload by content digest and record its metadata.
+
+    The temp file becomes the blob for its digest, or is discarded if that
+    content is already stored, and the blob's reference count is bumped. File
+    moves happen inside the writer's transaction, which holds the database
+    write lock, so they are serialized with other workers' uploads and with
+    garbage collection.
+    """
+    saved_name = f"{upload['digest']}{upload['ext']}"
+    info = {
+        "original_name": upload["filename"],
+        "saved_name": saved_name,
+        "path": str(UPLOAD_DIR / saved_name),
+        "size": upload["size"],
+        "uploaded_at": datetime.now().isoformat(),
+    }
+
+    def write(conn: sqlite3.Connection) -> bool:
+        existing = conn.execute("SELECT 1 FROM upload_blobs WHERE digest = ?", (upload["digest"],)).fetchone()
+        if existing:
+            conn.execute("UPDATE upload_blobs SET ref_count = ref_count + 1 WHERE digest = ?", (upload["digest"],))
+        else:
+            conn.execute(
+                "INSERT INTO upload_blobs (digest, path, size, ref_count, created_at) VALUES (?, ?, ?, 1, ?)",
+                (upload["digest"], info["path"], info["size"], info["uploaded_at"]),
             )
+        conn.execute(
+            "INSERT INTO uploaded_files (file_id, original_name, saved_name, path, size, uploaded_at, digest) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (file_id, info["original_name"], saved_name, info["path"], info["size"], info["uploaded_at"], upload["digest"]),
+        )
+        if existing and Path(info["path"]).exists():
+            upload["tmp_path"].unlink(missing_ok=True)
+        elif upload["tmp_path"].exists() or not Path(info["path"]).exists():
+            # Skipped only when a rolled-back batch already moved this file
+            os.replace(upload["tmp_path"], info["path"])
+        return bool(existing)
+
+    info["deduplicated"] = await app_db_write(write)
+    return info
+
+
+def collect_orphan_uploads(conn: sqlite3.Connection) -> int:
+    """Delete uploads never attached to an application and unreferenced blobs.
+
+    Runs inside the writer's transaction; returns the number of files removed.
+    """
+    cutoff = datetime.fromtimestamp(time.time() - UPLOAD_ORPHAN_TTL).isoformat()
+    orphans = conn.execute(
+        "SELECT file_id, digest, path FROM uploaded_files WHERE attached = 0 AND uploaded_at < ?",
+        (cutoff,),
+    ).fetchall()
+
+    removed = []
+    for file_id, digest, path in orphans:
+        conn.execute("DELETE FROM uploaded_files WHERE file_id = ?", (file_id,))
+        if digest:
+            conn.execute("UPDATE upload_blobs SET ref_count = ref_count - 1 WHERE digest = ?", (digest,))
+        else:
+            removed.append(path)  # Stored before deduplication, not shared
+
+    for digest, path in conn.execute("SELECT digest, path FROM upload_blobs WHERE ref_count <= 0").fetchall():
+        conn.execute("DELETE FROM upload_blobs WHERE digest = ?", (digest,))
+        removed.append(path)
+
+    for path in removed:
+        Path(path).unlink(missing_ok=True)
+    return len(removed)
+
+
+def clean_incoming_uploads():
+    """Remove temp files left behind by uploads interrupted mid-stream."""
+    cutoff = time.time() - UPLOAD_GC_INTERVAL
+    for path in UPLOAD_TMP_DIR.glob("*.part"):
+        if path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+
+
+async def upload_gc():
+    """Periodically garbage collect orphaned uploads."""
+    while True:
+        try:
+            removed = await app_db_write(collect_orphan_uploads)
+            await asyncio.to_thread(clean_incoming_uploads)
+            if removed:
+                logger.info(f"Upload GC removed {removed} orphaned file(s)")
+        except Exception as e:
+            logger.error(f"Upload GC failed: {e}")
+        await asyncio.sleep(UPLOAD_GC_INTERVAL)
+
+
+async def get_uploaded_file(file_id: str) -> Optional[dict]:
+    """Look up metadata for an uploaded file."""
+    rows = await app_db_read(
+        "SELECT original_name, saved_name, path, size, uploaded_at FROM uploaded_files WHERE file_id = ?",
+        (file_id,),
+    )
+    return dict(rows[0]) if rows else None
+
+
+async def query_applications(
+    email: Optional[str] = None,
+    area: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = APP_PAGE_SIZE,
+    offset: int = 0,
+) -> dict:
+    """Return one page of applications (newest first) and the total match count."""
+    where, params = [], []
+    if email:
+        where.append("a.email = ?")
+        params.append(email.strip().lower())
+    if area:
+        where.append("a.id IN (SELECT application_id FROM application_areas WHERE area = ?)")
+        params.append(area)
+    if since:
+        where.append("a.submitted_at >= ?")
+        params.append(since)
+    if until:
+        where.append("a.submitted_at < ?")
+        params.append(until)
+    clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+    rows = await app_db_read(
+        f"SELECT a.id, a.data FROM applications a {clause} ORDER BY a.id DESC LIMIT ? OFFSET ?",
+        (*params, limit, offset),
+    )
+    total = (await app_db_read(f"SELECT COUNT(*) FROM applications a {clause}", tuple(params)))[0][0]
+    return {
+        "applications": [{**json.loads(row["data"]), "id": row["id"]} for row in rows],
+        "count": total,
+        "limit": limit,
+        "offset": offset,
+    }
+
+
+# =============================================================================
+# EMAIL OUTBOX
+# =============================================================================
+
+outbox_workers: List[asyncio.Task] = []
+outbox_wakeup = asyncio.Event()  # set when new messages are queued
+
+
+def get_outbox_sender(kind: str):
+    """Map an outbox message kind to the function that delivers it."""
+    return {
+        "team_notification": send_team_notification,
+        "applicant_confirmation": send_applicant_confirmation,
+        "contact_notification": send_contact_notification,
+    }[kind]
+
+
+def get_outbox_batch_sender(kind: str):
+    """Map a message kind to a sender taking a list, if it can be batched."""
+    return {
+        "applicant_confirmation": send_applicant_confirmations,
+    }.get(kind)
+
+
+def outbox_idempotency_key(kind: str, data: dict) -> str:
+    """Derive a key so the same message submitted twice in a day is sent once."""
+    content = {k: v for k, v in data.items() if k not in ("submitted_at", "ip", "resume_file")}
+    digest = hashlib.sha256(json.dumps([kind, content], sort_keys=True, default=str).encode()).hexdigest()
+    return f"{kind}:{datetime.now().date().isoformat()}:{digest[:32]}"
+
+
+async def enqueue_emails(messages: List[tuple]):
+    """Persist (kind, data) messages for background delivery.
+
+    Duplicates (same idempotency key) are ignored.
+    """
+    now = time.time()
+    created_at = datetime.now().isoformat()
+    rows = [
+        (kind, outbox_idempotency_key(kind, data), json.dumps(data), now, created_at)
+        for kind, data in messages
+    ]
+    await app_db_write(lambda conn: conn.executemany(
+        "INSERT OR IGNORE INTO email_outbox (kind, idempotency_key, data, next_attempt_at, created_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        rows,
+    ))
+    ensure_outbox_workers()
+    outbox_wakeup.set()
+
+
+def claim_outbox_messages(conn: sqlite3.Connection) -> List[dict]:
+    """Mark the next due message as sending (inside the writer's transaction).
+
+    When the message kind can be batched, other due messages of the same kind
+    are claimed with it, up to SPARKPOST_BATCH_SIZE.
+    """
+    now = time.time()
+    row = conn.execute(
+        "SELECT id, kind, data, attempts FROM email_outbox "
+        "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT 1",
+        (now,),
+    ).fetchone()
+    if row is None:
+        return []
+
+    rows = [row]
+    if get_outbox_batch_sender(row[1]):
+        rows += conn.execute(
+            "SELECT id, kind, data, attempts FROM email_outbox "
+            "WHERE status = 'pending' AND next_attempt_at <= ? AND kind = ? AND id != ? "
+            "ORDER BY next_attempt_at LIMIT ?",
+            (now, row[1], row[0], SPARKPOST_BATCH_SIZE - 1),
+        ).fetchall()
+
+    conn.executemany("UPDATE email_outbox SET status = 'sending' WHERE id = ?", [(r[0],) for r in rows])
+    return [{"id": r[0], "kind": r[1], "data": json.loads(r[2]), "attempts": r[3]} for r in rows]
+
+
+async def record_outbox_result(message: dict, delivered: bool, error: Optional[str] = None):
+    """Mark a message sent, schedule a retry with backoff, or dead-letter it."""
+    attempts = message["attempts"] + 1
+    if delivered:
+        sql, params = "UPDATE email_outbox SET status = 'sent', attempts = ?, sent_at = ? WHERE id = ?", \
+            (attempts, datetime.now().isoformat(), message["id"])
+    elif attempts >= OUTBOX_MAX_ATTEMPTS:
+        logger.error(f"Dead-lettering {message['kind']} #{message['id']} after {attempts} attempts: {error}")
+        sql, params = "UPDATE email_outbox SET status = 'dead', attempts = ?, last_error = ? WHERE id = ?", \
+            (attempts, error, message["id"])
+    else:
+        delay = min(OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), OUTBOX_BACKOFF_MAX)
+        delay *= random.uniform(0.8, 1.2)  # Jitter so retries don't align
+        logger.warning(f"Retrying {message['kind']} #{message['id']} in {delay:.0f}s (attempt {attempts})")
+        sql, params = "UPDATE email_outbox SET status = 'pending', attempts = ?, last_error = ?, next_attempt_at = ? WHERE id = ?", \
+            (attempts, error, time.time() + delay, message["id"])
+    await app_db_write(lambda conn: conn.execute(sql, params))
+
+
+async def outbox_worker():
+    """Deliver due outbox messages until cancelled."""
+    while True:
+        # Clear before claiming so a message queued during the claim still wakes us
+        outbox_wakeup.clear()
+        try:
+            messages = await app_db_write(claim_outbox_messages)
+        except Exception as e:
+            logger.error(f"Outbox claim failed: {e}")
+            messages = []
+
+        if not messages:
+            try:
+                await asyncio.wait_for(outbox_wakeup.wait(), timeout=OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        kind = messages[0]["kind"]
+        try:
+            if len(messages) > 1:
+                delivered = await get_outbox_batch_sender(kind)([m["data"] for m in messages])
+            else:
+                delivered = await get_outbox_sender(kind)(messages[0]["data"])
+            error = None if delivered else "SparkPost delivery failed"
+        except Exception as e:
+            delivered, error = False, str(e)[:200]
+        # Recorded concurrently so the updates share one database batch
+        await asyncio.gather(*(record_outbox_result(m, delivered, error) for m in messages))
+
+
+def ensure_outbox_workers():
+    """Start the delivery workers if SparkPost is configured and they are not running."""
+    if worker_role == "follower":
+        notify_leader({"type": "outbox"})  # Only the leader delivers
+        return
+    if not SPARKPOST_API_KEY:
+        return  # Messages stay queued until a key is configured
+    outbox_workers[:] = [task for task in outbox_workers if not task.done()]
+    while len(outbox_workers) < OUTBOX_WORKERS:
+        outbox_workers.append(asyncio.create_task(outbox_worker()))
+
+
+async def start_outbox():
+    """Requeue messages interrupted mid-send by a restart and start delivering."""
+    await app_db_write(lambda conn: conn.execute(
+        "UPDATE email_outbox SET status = 'pending' WHERE status = 'sending'"
+    ))
+    if not SPARKPOST_API_KEY:
+        logger.warning("SparkPost API key not configured, outbound email will stay queued")
+    ensure_outbox_workers()
+
+
+async def stop_outbox():
+    """Cancel the delivery workers; in-flight messages are retried on next start."""
+    for task in outbox_workers:
+        task.cancel()
+    await asyncio.gather(*outbox_workers, return_exceptions=True)
+    outbox_workers.clear()
+
+
+# =============================================================================
+# RESUME UPLOADS
+# =============================================================================
+
+class UploadRejected(Exception):
+    """An upload failed validation; carries the HTTP status to respond with."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def matches_signature(ext: str, head: bytes) -> bool:
+    """Check a file's leading bytes against the signatures for its extension."""
+    return any(head.startswith(signature) for signature in FILE_SIGNATURES[ext])
+
+
+async def receive_upload(request: Request) -> dict:
+    """Stream the multipart `file` field of a request into a temp file.
+
+    The body is parsed chunk by chunk as it arrives, so at most one network
+    chunk is held in memory. Uploads are rejected as soon as they exceed
+    MAX_FILE_SIZE (or declare a larger Content-Length) or their first bytes do
+    not match the extension. Disk writes run off the event loop.
+
+    Returns the original filename, extension, size, SHA-256 digest and temp
+    path; the caller moves the temp file into place.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadRejected(400, "Expected a multipart/form-data upload")
+
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > MAX_FILE_SIZE + UPLOAD_FORM_OVERHEAD:
+        raise UploadRejected(400, "File size exceeds 10MB limit")
+
+    # Parser callbacks only record events; they are handled after each write
+    events = []
+    header = {"field": bytearray(), "value": bytearray(), "headers": {}}
+
+    def on_header_end():
+        header["headers"][bytes(header["field"]).lower()] = bytes(header["value"])
+        header["field"].clear()
+        header["value"].clear()
+
+    def on_headers_finished():
+        events.append(("headers", header["headers"]))
+        header["headers"] = {}
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_header_field": lambda data, start, end: header["field"].extend(data[start:end]),
+        "on_header_value": lambda data, start, end: header["value"].extend(data[start:end]),
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": lambda data, start, end: events.append(("data", bytes(data[start:end]))),
+        "on_part_end": lambda: events.append(("end", None)),
+    })
+
+    tmp_path = UPLOAD_TMP_DIR / f"{uuid.uuid4().hex}.part"
+    upload = {"filename": None, "ext": None, "size": 0, "tmp_path": tmp_path}
+    digest = hashlib.sha256()
+    handle = None
+    in_file = False
+    head = b""
+
+    try:
+        async for chunk in request.stream():
+            try:
+                parser.write(chunk)
+            except MultipartParseError as e:
+                raise UploadRejected(400, "Malformed multipart body") from e
+            for kind, value in events:
+                if kind == "headers":
+                    _, options = parse_options_header(value.get(b"content-disposition", b""))
+                    in_file = handle is None and options.get(b"name") == b"file" and b"filename" in options
+                    if in_file:
+                        upload["filename"] = options[b"filename"].decode("utf-8", "replace")
+                        upload["ext"] = Path(upload["filename"]).suffix.lower()
+                        if upload["ext"] not in ALLOWED_EXTENSIONS:
+                            raise UploadRejected(400, f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}")
+                        handle = await asyncio.to_thread(open, tmp_path, "wb")
+
+                elif kind == "data" and in_file:
+                    upload["size"] += len(value)
+                    if upload["size"] > MAX_FILE_SIZE:
+                        raise UploadRejected(400, "File size exceeds 10MB limit")
+                    if len(head) < FILE_SNIFF_BYTES:
+                        head += value[:FILE_SNIFF_BYTES - len(head)]
+                        if len(head) >= FILE_SNIFF_BYTES and not matches_signature(upload["ext"], head):
+                            raise UploadRejected(400, "File content does not match its type")
+                    digest.update(value)
+                    await asyncio.to_thread(handle.write, value)
+
+                elif kind == "end":
+                    in_file = False
+            events.clear()
+        try:
+            parser.finalize()
+        except MultipartParseError as e:
+            raise UploadRejected(400, "Malformed multipart body") from e
+
+        if handle is None:
+            raise UploadRejected(400, "No file provided")
+        if not matches_signature(upload["ext"], head):
+            raise UploadRejected(400, "File content does not match its type")
+
+        await asyncio.to_thread(handle.close)
+        upload["digest"] = digest.hexdigest()
+        return upload
+
+    except BaseException:
+        if handle is not None:
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(tmp_path.unlink, True)
+        raise
+
+
+# =============================================================================
+# ADMISSION CONTROL
+# =============================================================================
+
+class RateLimiter:
+    """Per-client token buckets for one endpoint.
+
+    Each client starts with `burst` tokens, spends one per request and regains
+    them at burst/period per second. Buckets are kept in least-recently-seen
+    order; one idle for a full period is back at `burst`, the same as an
+    unknown client, so it is dropped.
+    """
+
+    def __init__(self, burst: int, period: float, max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.burst = burst
+        self.period = period
+        self.rate = burst / period
+        self.max_clients = max_clients
+        self.buckets: "OrderedDict[str, tuple]" = OrderedDict()  # client -> (tokens, updated)
+
+    def take(self, client: str, now: Optional[float] = None) -> float:
+        """Spend a token for `client`; return 0 if allowed, else seconds until one is available."""
+        if now is None:
+            now = time.monotonic()
+        entry = self.buckets.pop(client, None)
+        tokens = self.burst if entry is None else min(self.burst, entry[0] + (now - entry[1]) * self.rate)
+
+        while self.buckets:
+            oldest = next(iter(self.buckets.values()))
+            if now - oldest[1] < self.period and len(self.buckets) < self.max_clients:
+                break
+            self.buckets.popitem(last=False)
+
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / self.rate
+        self.buckets[client] = (tokens, now)
+        return retry_after
+
+
+rate_limiters = {endpoint: RateLimiter(burst, period) for endpoint, (burst, period) in RATE_LIMITS.items()}
+# Uploads currently being received, per client IP
+uploads_in_flight: Dict[str, int] = {}
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else 'unknown'
+
+
+def too_many_requests(retry_after: float, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"error": message},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+def check_rate_limit(request: Request, endpoint: str) -> Optional[JSONResponse]:
+    """Spend one of the client's tokens for `endpoint`; return a 429 response if none are left."""
+    retry_after = rate_limiters[endpoint].take(client_ip(request))
+    if not retry_after:
+        return None
+    rate_limit_rejections.inc(endpoint, "rate")
+    logger.warning(f"Rate limited {client_ip(request)} on /api/{endpoint}")
+    return too_many_requests(retry_after, "Too many requests, please try again later")
+
+
+def acquire_upload_slot(ip: str) -> bool:
+    """Reserve a concurrent upload slot for `ip`, unless a cap is reached."""
+    if sum(uploads_in_flight.values()) >= UPLOAD_MAX_CONCURRENT:
+        return False
+    if uploads_in_flight.get(ip, 0) >= UPLOAD_MAX_CONCURRENT_PER_IP:
+        return False
+    uploads_in_flight[ip] = uploads_in_flight.get(ip, 0) + 1
+    return True
+
+
+def release_upload_slot(ip: str):
+    remaining = uploads_in_flight[ip] - 1
+    if remaining:
+        uploads_in_flight[ip] = remaining
+    else:
+        del uploads_in_flight[ip]
+
+
+# =============================================================================
+# APPLICATION API Endpoints
+# =============================================================================
+
+@app.post("/api/upload")
+async def upload_file(request: Request):
+    """Handle resume file uploads."""
+    ip = client_ip(request)
+    if not acquire_upload_slot(ip):
+        rate_limit_rejections.inc("upload", "concurrency")
+        return too_many_requests(UPLOAD_BUSY_RETRY_AFTER, "Too many uploads in progress, please try again shortly")
+    limited = check_rate_limit(request, "upload")
+    if limited:
+        release_upload_slot(ip)
+        return limited
+
+    try:
+        upload = await receive_upload(request)
 
         # Generate unique file ID
         file_id = str(uuid.uuid4())
-        safe_filename = f"{file_id}{ext}"
-        file_path = UPLOAD_DIR / safe_filename
-
-        # Save file
-        with open(file_path, "wb") as f:
-            f.write(content)
-
-        # Store file info
-        uploaded_files[file_id] = {
-            "original_name": file.filename,
-            "saved_name": safe_filename,
-            "path": str(file_path),
-            "size": len(content),
-            "uploaded_at": datetime.now().isoformat(),
-        }
 
-        logger.info(f"File uploaded: {file.filename} -> {safe_filename}")
+        # Store by content digest (atomic rename, or reuse of identical content)
+        info = await save_uploaded_file(file_id, upload)
+        upload_size.observe(upload["size"])
+
+        logger.info(f"File uploaded: {upload['filename']} -> {info['saved_name']}"
+                    f"{' (deduplicated)' if info['deduplicated'] else ''}")
 
         return JSONResponse(
             status_code=200,
-            content={"file_id": file_id, "filename": file.filename}
+            content={"file_id": file_id, "filename": upload["filename"]}
         )
 
+    except UploadRejected as e:
+        upload_rejections.inc(e.status_code)
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"error": str(e)}
+        )
     except Exception as e:
         logger.error(f"File upload error: {e}")
         return JSONResponse(
             status_code=500,
             content={"error": "Failed to upload file"}
         )
+    finally:
+        release_upload_slot(ip)
 
 
 @app.post("/api/apply")
 async def submit_application(request: Request):
     """Handle application submissions."""
+    limited = check_rate_limit(request, "apply")
+    if limited:
+        return limited
+
     try:
         data = await request.json()
 
@@ -772,22 +2899,21 @@ async def submit_application(request: Request):
 
         # Add file info if resume was uploaded
         if data.get('resume_file_id'):
-            file_info = uploaded_files.get(data['resume_file_id'])
+            file_info = await get_uploaded_file(data['resume_file_id'])
             if file_info:
                 data['resume_file'] = file_info
 
         # Add metadata
         data['submitted_at'] = datetime.now().isoformat()
-        data['ip'] = request.client.host if request.client else 'unknown'
+        data['ip'] = client_ip(request)
 
         # Store application
-        applications.append(data)
+        await save_application(data)
 
         logger.info(f"New application received from {data['name']} ({data['email']}) - Areas: {', '.join(data.get('areas', []))}")
 
-        # Send email notifications
-        await send_team_notification(data)
-        await send_applicant_confirmation(data)
+        # Queue email notifications for background delivery
+        await enqueue_emails([("team_notification", data), ("applicant_confirmation", data)])
 
         return JSONResponse(
             status_code=200,
@@ -803,14 +2929,27 @@ async def submit_application(request: Request):
 
 
 @app.get("/api/applications")
-async def list_applications():
-    """List all applications (admin endpoint)."""
-    return JSONResponse(content={"applications": applications, "count": len(applications)})
+async def list_applications(
+    email: Optional[str] = None,
+    area: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = APP_PAGE_SIZE,
+    offset: int = 0,
+):
+    """List applications, newest first, with filters and pagination (admin endpoint)."""
+    limit = max(1, min(limit, APP_MAX_PAGE_SIZE))
+    offset = max(0, offset)
+    return JSONResponse(content=await query_applications(email, area, since, until, limit, offset))
 
 
 @app.post("/api/contact")
 async def handle_contact(request: Request):
     """Handle contact form submissions from pitch deck."""
+    limited = check_rate_limit(request, "contact")
+    if limited:
+        return limited
+
     try:
         data = await request.json()
         name = data.get('name', '').strip()
@@ -824,22 +2963,16 @@ async def handle_contact(request: Request):
                 content={"error": "Name, email, and message are required"}
             )
 
-        # Send email notification
-        success = await send_contact_notification({
+        # Queue email notification for background delivery
+        await enqueue_emails([("contact_notification", {
             'name': name,
             'email': email,
             'subject': subject,
             'message': message
-        })
+        })])
 
-        if success:
-            logger.info(f"Contact form submitted: {name} <{email}> - {subject}")
-            return JSONResponse(content={"success": True, "message": "Message sent successfully"})
-        else:
-            return JSONResponse(
-                status_code=500,
-                content={"error": "Failed to send message"}
-            )
+        logger.info(f"Contact form submitted: {name} <{email}> - {subject}")
+        return JSONResponse(content={"success": True, "message": "Message sent successfully"})
 
     except Exception as e:
         logger.error(f"Contact form error: {e}")
@@ -855,39 +2988,7 @@ async def send_contact_notification(data: dict) -> bool:
         logger.warning("SparkPost API key not configured, skipping contact notification")
         return False
 
-    html_content = f"""
-    <html>
-    <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f5f5f5;">
-        <div style="background: linear-gradient(135deg, #d4af37 0%, #f4d03f 100%); padding: 20px; border-radius: 12px 12px 0 0;">
-            <h1 style="color: #0d0d14; margin: 0; font-size: 24px;">New Contact Inquiry</h1>
-            <p style="color: #0d0d14; margin: 5px 0 0 0; opacity: 0.8;">{data['subject']}</p>
-        </div>
-        <div style="background: #ffffff; padding: 25px; border-radius: 0 0 12px 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-            <table style="width: 100%; border-collapse: collapse;">
-                <tr>
-                    <td style="padding: 12px 0; border-bottom: 1px solid #eee; font-weight: 600; color: #333; width: 100px;">From:</td>
-                    <td style="padding: 12px 0; border-bottom: 1px solid #eee; color: #555;">{data['name']}</td>
-                </tr>
-                <tr>
-                    <td style="padding: 12px 0; border-bottom: 1px solid #eee; font-weight: 600; color: #333;">Email:</td>
-                    <td style="padding: 12px 0; border-bottom: 1px solid #eee; color: #555;"><a href="mailto:{data['email']}" style="color: #d4af37;">{data['email']}</a></td>
-                </tr>
-                <tr>
-                    <td style="padding: 12px 0; border-bottom: 1px solid #eee; font-weight: 600; color: #333;">Subject:</td>
-                    <td style="padding: 12px 0; border-bottom: 1px solid #eee; color: #555;">{data['subject']}</td>
-                </tr>
-            </table>
-            <div style="margin-top: 20px;">
-                <h3 style="color: #333; margin: 0 0 10px 0; font-size: 16px;">Message:</h3>
-                <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; color: #555; line-height: 1.6; white-space: pre-wrap;">{data['message']}</div>
-            </div>
-        </div>
-        <p style="text-align: center; color: #888; font-size: 12px; margin-top: 20px;">
-            Sent from QUANTA Pitch Deck - qsub.net
-        </p>
-    </body>
-    </html>
-    """
+    html_content = render_email("contact_notification", data=data)
 
     payload = {
         "recipients": [{"address": email} for email in NOTIFICATION_EMAILS],
@@ -899,129 +3000,678 @@ async def send_contact_notification(data: dict) -> bool:
         }
     }
 
-    headers = {
-        "Authorization": SPARKPOST_API_KEY,
-        "Content-Type": "application/json"
-    }
+    if await post_transmission(payload, "contact notification"):
+        logger.info(f"Contact notification sent for: {data['email']}")
+        return True
+    return False
+
 
+# =============================================================================
+# WORKER COORDINATION
+# =============================================================================
+
+# "leader" runs collectors, history, outbox and upload GC (always the case with
+# one worker); "follower" serves REST/WebSocket from the leader's snapshots.
+# Applications, uploads and the outbox are shared through SQLite and the upload
+# directory, so every worker can accept writes.
+worker_role = "leader"
+worker_lock = None  # leader: open handle of WORKER_LOCK_FILE holding the lock
+worker_ipc_server: Optional[asyncio.AbstractServer] = None
+worker_followers: set = set()  # leader: StreamWriters of connected followers
+worker_leader: Optional[asyncio.StreamWriter] = None  # follower: connection to the leader
+worker_follow_task: Optional[asyncio.Task] = None
+worker_snapshot_ready = asyncio.Event()  # follower: set once the first snapshot arrives
+worker_metrics: Dict[str, tuple] = {}  # leader: follower pid -> (received monotonic, metric_samples())
+worker_metrics_text: Optional[str] = None  # follower: latest merged exposition from the leader
+leader_tasks: List[asyncio.Task] = []
+
+
+async def start_leader_duties():
+    """Start the work that must run in exactly one worker."""
+    await start_outbox()
+    leader_tasks.extend([
+        asyncio.create_task(history_sampler()),
+        asyncio.create_task(history_flusher()),
+        asyncio.create_task(upload_gc()),
+    ])
+    if SERVER_WORKERS > 1:
+        leader_tasks.append(asyncio.create_task(broadcast_worker_metrics()))
+    if dash_connections:
+        ensure_dash_producer()
+
+
+async def stop_leader_duties():
+    """Stop the leader's background work, persisting what it holds."""
+    for task in leader_tasks:
+        task.cancel()
+    leader_tasks.clear()
+    await flush_dash_history()
+    await stop_outbox()
+
+
+def encode_ipc_message(message: dict) -> bytes:
+    return (json.dumps(message) + "\n").encode()
+
+
+def broadcast_to_followers(message: dict):
+    """Send a message to every follower without waiting; stalled followers are dropped."""
+    if not worker_followers:
+        return
+    line = encode_ipc_message(message)
+    for writer in list(worker_followers):
+        if writer.transport.get_write_buffer_size() > WORKER_IPC_MAX_BUFFER:
+            logger.warning("Dropping a follower that stopped reading snapshots")
+            worker_followers.discard(writer)
+            writer.close()
+        else:
+            writer.write(line)
+
+
+def notify_leader(message: dict):
+    """Send a message to the leader (follower only; dropped while disconnected)."""
+    if worker_leader is not None and not worker_leader.is_closing():
+        worker_leader.write(encode_ipc_message(message))
+
+
+async def serve_follower(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Leader side of one follower connection: push snapshots, act on its requests."""
+    worker_followers.add(writer)
+    writer.write(encode_ipc_message({"type": "hello", "version": WORKER_IPC_VERSION, "pid": os.getpid()}))
+    if dash_cache:
+        writer.write(encode_ipc_message({"type": "snapshot", "data": dash_cache}))
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(SPARKPOST_API_URL, json=payload, headers=headers) as response:
-                if response.status == 200:
-                    logger.info(f"Contact notification sent for: {data['email']}")
-                    return True
-                else:
-                    error_text = await response.text()
-                    logger.error(f"SparkPost error: {response.status} - {error_text}")
-                    return False
-    except Exception as e:
-        logger.error(f"Failed to send contact notification: {e}")
+        async for line in reader:
+            message = json.loads(line)
+            if message.get("type") == "refresh":
+                start_dash_refresh()
+            elif message.get("type") == "outbox":
+                ensure_outbox_workers()
+                outbox_wakeup.set()
+            elif message.get("type") == "metrics":
+                worker_metrics[str(message["worker"])] = (time.monotonic(), message["samples"])
+    except (OSError, ValueError) as e:
+        logger.warning(f"Follower connection error: {e}")
+    finally:
+        worker_followers.discard(writer)
+        writer.close()
+
+
+def handle_leader_message(message: dict):
+    """Apply a message from the leader to this follower's state."""
+    global dash_cache, dash_cache_time, worker_metrics_text
+    if message.get("type") == "snapshot":
+        dash_cache = message["data"]
+        dash_cache_time = datetime.now()
+        worker_snapshot_ready.set()
+        publish_dash_snapshot(dash_cache)
+    elif message.get("type") == "sample" and dash_cache:
+        # Mirror the leader's history in memory; only the leader writes the files
+        record_dash_history(dash_cache)
+        for series in dash_history.values():
+            series.unflushed = 0
+    elif message.get("type") == "metrics":
+        worker_metrics_text = message["text"]
+
+
+def cluster_metrics_text() -> str:
+    """Leader: render this process's metrics and every live follower's, labelled by worker."""
+    workers = {str(os.getpid()): metric_samples()}
+    for worker, (received, samples) in list(worker_metrics.items()):
+        if time.monotonic() - received > 3 * WORKER_METRICS_INTERVAL:
+            del worker_metrics[worker]  # Follower exited
+        else:
+            workers[worker] = samples
+    return render_metrics(workers)
+
+
+async def broadcast_worker_metrics():
+    """Leader: share the merged exposition so any worker can answer a scrape."""
+    while True:
+        broadcast_to_followers({"type": "metrics", "text": cluster_metrics_text()})
+        await asyncio.sleep(WORKER_METRICS_INTERVAL)
+
+
+async def push_worker_metrics():
+    """Follower: send this process's metrics to the leader on a fixed interval."""
+    while True:
+        notify_leader({"type": "metrics", "worker": os.getpid(), "samples": metric_samples()})
+        await asyncio.sleep(WORKER_METRICS_INTERVAL)
+
+
+def acquire_worker_lock() -> bool:
+    """Take the leader lock without blocking; the OS releases it if this process dies."""
+    global worker_lock
+    WORKER_LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    handle = open(WORKER_LOCK_FILE, "a+b")
+    handle.seek(0)
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        handle.close()
         return False
+    worker_lock = handle
+    return True
 
 
-# Static file serving - must come after API routes
-# Serve _astro assets
-if (DIST_DIR / "_astro").exists():
-    app.mount("/_astro", StaticFiles(directory=str(DIST_DIR / "_astro")), name="astro_assets")
+def release_worker_lock():
+    global worker_lock
+    if worker_lock is None:
+        return
+    if fcntl is None:
+        worker_lock.seek(0)
+        msvcrt.locking(worker_lock.fileno(), msvcrt.LK_UNLCK, 1)
+    worker_lock.close()
+    worker_lock = None
+
+
+async def claim_leadership() -> bool:
+    """Try to become the leader by taking the lock file (the OS allows one holder)."""
+    global worker_ipc_server, worker_role
+    if not acquire_worker_lock():
+        return False
+    worker_role = "leader"
+    logger.info(f"Worker {os.getpid()} is the leader")
+    try:
+        worker_ipc_server = await asyncio.start_server(
+            serve_follower, WORKER_IPC_HOST, WORKER_IPC_PORT, limit=WORKER_IPC_MAX_MESSAGE
+        )
+    except OSError as e:
+        logger.error(f"Leader cannot listen on {WORKER_IPC_HOST}:{WORKER_IPC_PORT} ({e}); "
+                     f"other workers will not receive dashboard snapshots")
+    await start_leader_duties()
+    return True
+
+
+async def read_leader_hello(reader: asyncio.StreamReader) -> bool:
+    """Check that the peer on the IPC port is a leader speaking our protocol version."""
+    try:
+        hello = json.loads(await asyncio.wait_for(reader.readline(), timeout=WORKER_IPC_HELLO_TIMEOUT))
+    except (ValueError, asyncio.TimeoutError):
+        hello = None
+    if isinstance(hello, dict) and hello.get("type") == "hello" and hello.get("version") == WORKER_IPC_VERSION:
+        return True
+    logger.error(f"{WORKER_IPC_HOST}:{WORKER_IPC_PORT} did not answer as a protocol v{WORKER_IPC_VERSION} "
+                 f"leader (got {hello!r}); is another program using WORKER_IPC_PORT?")
+    return False
+
+
+async def follow_leader():
+    """Mirror the leader's snapshots, taking over if it goes away."""
+    global worker_leader
+    while True:
+        try:
+            reader, worker_leader = await asyncio.open_connection(
+                WORKER_IPC_HOST, WORKER_IPC_PORT, limit=WORKER_IPC_MAX_MESSAGE
+            )
+            if await read_leader_hello(reader):
+                logger.info(f"Worker {os.getpid()} is following the leader")
+                pusher = asyncio.create_task(push_worker_metrics())
+                try:
+                    async for line in reader:
+                        handle_leader_message(json.loads(line))
+                finally:
+                    pusher.cancel()
+                logger.warning("Leader connection closed")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Leader connection failed: {e}")
+        finally:
+            if worker_leader is not None:
+                worker_leader.close()
+                worker_leader = None
+
+        await asyncio.sleep(WORKER_IPC_RETRY * random.uniform(0.5, 1.5))
+        if await claim_leadership():
+            return
+
+
+async def start_worker_coordination():
+    """Decide this worker's role and start the matching background work."""
+    global worker_role, worker_follow_task
+    if SERVER_WORKERS <= 1:
+        await start_leader_duties()
+        return
+    if not await claim_leadership():
+        worker_role = "follower"
+        worker_follow_task = asyncio.create_task(follow_leader())
+
+
+async def stop_worker_coordination():
+    """Stop following or leading; followers elect a new leader when this one goes."""
+    if worker_follow_task is not None:
+        worker_follow_task.cancel()
+    if worker_ipc_server is not None:
+        worker_ipc_server.close()
+        for writer in list(worker_followers):
+            writer.close()
+    if worker_role == "leader":
+        await stop_leader_duties()
+        release_worker_lock()
+
+
+# =============================================================================
+# STATIC ASSETS
+# =============================================================================
+
+class StaticAsset:
+    """One file from the Astro build, held in memory with precompressed variants."""
+
+    def __init__(self, rel_path: str, path: Path, stat: os.stat_result):
+        self.rel_path = rel_path
+        self.path = path
+        self.stat = stat
+        self.media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.cache_control = STATIC_IMMUTABLE_CACHE if rel_path.startswith(STATIC_IMMUTABLE_DIR) else STATIC_REVALIDATE_CACHE
+        self.variants: Dict[str, bytes] = {}  # Content-Encoding -> compressed body
+
+        if stat.st_size > STATIC_CACHE_MAX_FILE:
+            self.body = None
+            self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            return
+
+        self.body = path.read_bytes()
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        if len(self.body) < STATIC_COMPRESS_MIN_SIZE or self.media_type not in STATIC_COMPRESS_TYPES:
+            return
+        compressed = {"gzip": gzip.compress(self.body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed["br"] = brotli.compress(self.body, quality=11)
+        self.variants = {encoding: data for encoding, data in compressed.items() if len(data) < len(self.body)}
+
+    def changed(self, stat: os.stat_result) -> bool:
+        return (stat.st_mtime_ns, stat.st_size) != (self.stat.st_mtime_ns, self.stat.st_size)
+
+
+# Relative posix path within DIST_DIR -> asset, built at startup
+static_assets: Dict[str, StaticAsset] = {}
+# Public URL path (no leading/trailing slash, casefolded) -> asset, derived from
+# static_assets; casefolded to match the case-insensitive disk lookups on Windows
+static_routes: Dict[str, StaticAsset] = {}
+
+
+def scan_static_dir() -> Dict[str, os.stat_result]:
+    """Stat every file under DIST_DIR, keyed by relative posix path."""
+    found = {}
+    for root, _, files in os.walk(DIST_DIR):
+        for name in files:
+            path = Path(root) / name
+            rel_path = path.relative_to(DIST_DIR).as_posix()
+            if rel_path.startswith("docs/"):
+                continue  # served from the docs index
+            try:
+                found[rel_path] = path.stat()
+            except OSError:
+                continue
+    return found
+
+
+def build_static_routes(assets: Dict[str, StaticAsset]) -> Dict[str, StaticAsset]:
+    """Map every public URL to its file: exact path, then path.html, then path/index.html."""
+    routes = {}
+    # Lowest precedence first so later passes overwrite
+    for rel_path, asset in assets.items():
+        if rel_path == "index.html":
+            routes[""] = asset
+        elif rel_path.endswith("/index.html"):
+            routes[rel_path[:-len("/index.html")].casefold()] = asset
+    for rel_path, asset in assets.items():
+        if rel_path.endswith(".html"):
+            routes[rel_path[:-len(".html")].casefold()] = asset
+    for rel_path, asset in assets.items():
+        routes[rel_path.casefold()] = asset
+    return routes
+
+
+def build_static_manifest(scan: Optional[Dict[str, os.stat_result]] = None):
+    """Load every file under DIST_DIR into the static asset cache and route table.
+
+    Assets whose size and mtime are unchanged are reused rather than re-read
+    and recompressed.
+    """
+    global static_assets, static_routes
+    if scan is None:
+        scan = scan_static_dir()
+
+    assets = {}
+    for rel_path, stat in scan.items():
+        previous = static_assets.get(rel_path)
+        if previous is not None and not previous.changed(stat):
+            assets[rel_path] = previous
+            continue
+        try:
+            assets[rel_path] = StaticAsset(rel_path, DIST_DIR / rel_path, stat)
+        except OSError as e:
+            logger.warning(f"Skipping static file {rel_path}: {e}")
+    static_assets = assets
+    static_routes = build_static_routes(assets)
+
+    cached = sum(len(a.body) for a in assets.values() if a.body is not None)
+    compressed = sum(1 for a in assets.values() if a.variants)
+    logger.info(
+        f"Static manifest: {len(assets)} files, {len(static_routes)} routes, "
+        f"{cached // 1024}KB cached, {compressed} precompressed"
+    )
+
+
+async def watch_static_dir():
+    """Rebuild the manifest and docs index when their files are added, changed or removed (dev)."""
+    while True:
+        await asyncio.sleep(STATIC_WATCH_INTERVAL)
+        try:
+            scan = await asyncio.to_thread(scan_static_dir)
+            if scan.keys() != static_assets.keys() or any(
+                static_assets[rel_path].changed(stat) for rel_path, stat in scan.items()
+            ):
+                logger.info("dist/ changed, rebuilding static manifest")
+                await asyncio.to_thread(build_static_manifest, scan)
+
+            docs_scan = await asyncio.to_thread(scan_docs_dirs)
+            if docs_scan.keys() != docs_index.keys() or any(
+                docs_index[rel_path].changed(path, stat) for rel_path, (path, stat) in docs_scan.items()
+            ):
+                logger.info("Docs changed, rebuilding docs index")
+                await asyncio.to_thread(build_docs_index, docs_scan)
+        except Exception as e:
+            logger.error(f"Static watcher error: {e}")
+
+
+def get_static_asset(rel_path: str) -> Optional[StaticAsset]:
+    """Look up a built file by its path relative to DIST_DIR."""
+    return static_assets.get(rel_path)
+
+
+def resolve_static_route(path: str) -> Optional[StaticAsset]:
+    """Resolve a request path to a built file without touching the disk."""
+    return static_routes.get(path.strip("/").casefold())
+
+
+def accepted_encodings(header: str) -> set:
+    """Parse Accept-Encoding into the set of codings the client allows."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                pass
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def is_not_modified(request: Request, asset: "StaticAsset | DocFile") -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against an asset or document."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or asset.etag in tags
 
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(asset.stat.st_mtime) <= since
+    return False
+
+
+def static_response(request: Request, asset: StaticAsset) -> Response:
+    """Serve a cached asset with validators, picking a precompressed variant if accepted."""
+    headers = {
+        "ETag": asset.etag,
+        "Last-Modified": asset.last_modified,
+        "Cache-Control": asset.cache_control,
+    }
+    if asset.variants:
+        headers["Vary"] = "Accept-Encoding"
+
+    if is_not_modified(request, asset):
+        return Response(status_code=304, headers=headers)
+
+    if asset.body is None:
+        return FileResponse(asset.path, media_type=asset.media_type, headers=headers, stat_result=asset.stat)
+
+    body = asset.body
+    if asset.variants:
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in asset.variants:
+                body = asset.variants[encoding]
+                headers["Content-Encoding"] = encoding
+                break
+    return Response(content=body, media_type=asset.media_type, headers=headers)
+
+
+class DocFile:
+    """A document from DOCS_DIRS: its path and response metadata, taken from one stat.
+
+    The file is only opened while a response is being sent, so the build can
+    replace or delete it at any time (Windows refuses both on open or mapped files).
+    """
 
+    def __init__(self, path: Path, stat: os.stat_result):
+        self.path = path
+        self.stat = stat
+        self.size = stat.st_size
+        self.media_type = DOCS_MEDIA_TYPES.get(path.suffix.lower(), "application/octet-stream")
+        self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+    def changed(self, path: Path, stat: os.stat_result) -> bool:
+        return path != self.path or (stat.st_mtime_ns, stat.st_size) != (self.stat.st_mtime_ns, self.stat.st_size)
+
+    async def iter_bytes(self, handle, start: int, stop: int):
+        """Yield [start, stop) of an open handle in DOCS_CHUNK_SIZE reads off the event loop.
+
+        Stops early if the file was truncated since it was indexed; closes the handle.
+        """
+        try:
+            await asyncio.to_thread(handle.seek, start)
+            remaining = stop - start
+            while remaining > 0:
+                chunk = await asyncio.to_thread(handle.read, min(DOCS_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+
+# Relative posix path under /docs -> document, built at startup
+docs_index: Dict[str, DocFile] = {}
+# Casefolded relative path -> document, for case-insensitive URL lookups
+docs_routes: Dict[str, DocFile] = {}
+
+
+def scan_docs_dirs() -> Dict[str, tuple]:
+    """Stat every file in DOCS_DIRS as rel_path -> (path, stat); earlier dirs win."""
+    found = {}
+    for docs_dir in reversed(DOCS_DIRS):
+        for root, _, files in os.walk(docs_dir):
+            for name in files:
+                path = Path(root) / name
+                try:
+                    found[path.relative_to(docs_dir).as_posix()] = (path, path.stat())
+                except OSError:
+                    continue
+    return found
+
+
+def build_docs_index(scan: Optional[Dict[str, tuple]] = None):
+    """Index every document, reusing entries for files that have not changed."""
+    global docs_index, docs_routes
+    if scan is None:
+        scan = scan_docs_dirs()
+
+    index = {}
+    for rel_path, (path, stat) in scan.items():
+        previous = docs_index.get(rel_path)
+        if previous is not None and not previous.changed(path, stat):
+            index[rel_path] = previous
+            continue
+        try:
+            index[rel_path] = DocFile(path, stat)
+        except OSError as e:
+            logger.warning(f"Skipping document {rel_path}: {e}")
+    docs_index = index
+    docs_routes = {rel_path.casefold(): doc for rel_path, doc in index.items()}
+    logger.info(f"Docs index: {len(index)} files, {sum(d.size for d in index.values()) // 1024}KB")
+
+
+def parse_byte_range(header: str, size: int) -> Optional[tuple]:
+    """Parse a single 'bytes=' range into inclusive (start, end).
+
+    Returns None if the header should be ignored (malformed, another unit, or
+    several ranges, which are answered with the full body). A result with
+    start >= size is unsatisfiable.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            # Suffix range: the final N bytes
+            return max(size - int(last), 0), size - 1
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if start < 0 or (end is not None and end < start):
+        return None
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def if_range_matches(request: Request, doc: DocFile) -> bool:
+    """True if there is no If-Range or it still matches the document (strong comparison)."""
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(('"', "W/")):
+        return if_range == doc.etag
+    return if_range == doc.last_modified
+
+
+async def doc_response(request: Request, doc: DocFile) -> Response:
+    """Serve a document, answering Range requests with 206 partial content."""
+    headers = {
+        "ETag": doc.etag,
+        "Last-Modified": doc.last_modified,
+        "Cache-Control": STATIC_REVALIDATE_CACHE,
+        "Accept-Ranges": "bytes",
+    }
+    if is_not_modified(request, doc):
+        return Response(status_code=304, headers=headers)
+    if doc.size == 0:
+        return Response(status_code=200, media_type=doc.media_type, headers=headers)
+
+    status_code = 200
+    start, end = 0, doc.size - 1
+    range_header = request.headers.get("range")
+    if range_header and if_range_matches(request, doc):
+        byte_range = parse_byte_range(range_header, doc.size)
+        if byte_range is not None:
+            start, end = byte_range
+            if start >= doc.size:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{doc.size}"})
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{doc.size}"
+
+    try:
+        handle = await asyncio.to_thread(open, doc.path, "rb")
+    except OSError:
+        return JSONResponse(status_code=404, content={"error": "Document not found"})
+
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        doc.iter_bytes(handle, start, end + 1),
+        status_code=status_code,
+        media_type=doc.media_type,
+        headers=headers,
+    )
+
+
+# Static file serving - must come after API routes
+# (_astro bundles are served from the manifest by serve_static, cached as immutable)
 @app.get("/docs/tech-spec")
-async def serve_tech_spec_redirect():
+async def serve_tech_spec_redirect(request: Request):
     """Redirect tech-spec to the PDF file."""
-    file_path = Path(__file__).parent / "public" / "docs" / "QUANTA_Technical_Specification_v4.pdf"
-    if file_path.exists():
-        return FileResponse(file_path, media_type="application/pdf")
+    doc = docs_routes.get(TECH_SPEC_DOC.casefold())
+    if doc:
+        return await doc_response(request, doc)
     return JSONResponse(status_code=404, content={"error": "Technical specification not found"})
 
 
 @app.get("/docs/{path:path}")
-async def serve_docs(path: str):
+async def serve_docs(path: str, request: Request):
     """Serve documents like PDF specs."""
-    # First try dist/docs, then public/docs
-    file_path = DIST_DIR / "docs" / path
-    if not file_path.exists():
-        file_path = Path(__file__).parent / "public" / "docs" / path
-
-    if file_path.exists() and file_path.is_file():
-        # Determine media type
-        suffix = file_path.suffix.lower()
-        media_types = {
-            ".pdf": "application/pdf",
-            ".doc": "application/msword",
-            ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        }
-        media_type = media_types.get(suffix, "application/octet-stream")
-        return FileResponse(file_path, media_type=media_type)
+    doc = docs_routes.get(path.strip("/").casefold())
+    if doc:
+        return await doc_response(request, doc)
     return JSONResponse(status_code=404, content={"error": "Document not found"})
 
 
 @app.get("/litepaper")
-async def serve_litepaper():
+async def serve_litepaper(request: Request):
     """Serve interactive litepaper page."""
-    litepaper_file = DIST_DIR / "litepaper" / "index.html"
-    if litepaper_file.exists():
-        return FileResponse(litepaper_file, media_type="text/html")
+    asset = get_static_asset("litepaper/index.html")
+    if asset:
+        return static_response(request, asset)
     return JSONResponse(status_code=404, content={"error": "Litepaper page not found"})
 
 
 @app.get("/pitch/{path:path}")
-async def serve_pitch_subpath(path: str):
+async def serve_pitch_subpath(path: str, request: Request):
     """Serve pitch page for any subpath."""
-    pitch_file = DIST_DIR / "pitch" / "index.html"
-    if pitch_file.exists():
-        return FileResponse(pitch_file, media_type="text/html")
+    asset = get_static_asset("pitch/index.html")
+    if asset:
+        return static_response(request, asset)
     return JSONResponse(status_code=404, content={"error": "Not found"})
 
 
 @app.get("/pitch")
-async def serve_pitch():
+async def serve_pitch(request: Request):
     """Serve pitch deck page."""
-    pitch_file = DIST_DIR / "pitch" / "index.html"
-    if pitch_file.exists():
-        return FileResponse(pitch_file, media_type="text/html")
+    asset = get_static_asset("pitch/index.html")
+    if asset:
+        return static_response(request, asset)
     return JSONResponse(status_code=404, content={"error": "Pitch page not found"})
 
 
 @app.get("/{path:path}")
-async def serve_static(path: str):
+async def serve_static(path: str, request: Request):
     """Serve static files from Astro build."""
-    # Handle root path
-    if not path or path == "/":
-        index_file = DIST_DIR / "index.html"
-        if index_file.exists():
-            return FileResponse(index_file, media_type="text/html")
-
-    # Try exact path
-    file_path = DIST_DIR / path
-    if file_path.exists() and file_path.is_file():
-        return FileResponse(file_path)
-
-    # Try with .html extension
-    html_path = DIST_DIR / f"{path}.html"
-    if html_path.exists():
-        return FileResponse(html_path, media_type="text/html")
-
-    # Try as directory with index.html
-    index_path = DIST_DIR / path / "index.html"
-    if index_path.exists():
-        return FileResponse(index_path, media_type="text/html")
+    asset = resolve_static_route(path)
+    if asset:
+        return static_response(request, asset)
 
     # 404
     return JSONResponse(status_code=404, content={"error": "Not found"})
 
 
 @app.get("/")
-async def serve_index():
+async def serve_index(request: Request):
     """Serve the join page (homepage)."""
-    index_file = DIST_DIR / "index.html"
-    if index_file.exists():
-        return FileResponse(index_file, media_type="text/html")
+    asset = get_static_asset("index.html")
+    if asset:
+        return static_response(request, asset)
     return JSONResponse(status_code=404, content={"error": "Index not found"})
 
 
 def run():
-    """Run the server."""
-    uvicorn.run("server:app", host="0.0.0.0", port=8089, log_level="info")
+    """Run the server (SERVER_WORKERS processes, default 1)."""
+    uvicorn.run("server:app", host="0.0.0.0", port=8089, log_level="info", workers=SERVER_WORKERS)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# server.py is a top-level module that creates its data directories relative
+# to the working directory
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
@@ -0,0 +1,221 @@
+"""Tests for the pure helpers in server.py: dashboard patches, byte ranges,
+rate limiting, capped command output and the incremental miner log reader."""
+
+import asyncio
+import copy
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import server
+
+DASH_PAGE = Path(__file__).resolve().parent.parent / "src" / "pages" / "dash.astro"
+
+
+# =============================================================================
+# diff_dash_status / applyPatch
+# =============================================================================
+
+def apply_patch(doc, ops):
+    """Python twin of applyPatch in src/pages/dash.astro."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if op["path"] == "":
+            doc = copy.deepcopy(op["value"])
+            continue
+        keys = [k.replace("~1", "/").replace("~0", "~") for k in op["path"][1:].split("/")]
+        last = keys.pop()
+        parent = doc
+        for key in keys:
+            parent = parent[int(key)] if isinstance(parent, list) else parent[key]
+        if isinstance(parent, list):
+            index = len(parent) if last == "-" else int(last)
+            if op["op"] == "add":
+                parent.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(op["value"])
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = copy.deepcopy(op["value"])
+    return doc
+
+
+PATCH_CASES = [
+    ({"a": 1}, {"a": 1}),
+    ({"a": 1}, {"a": 2}),
+    ({"a": 1, "b": 2}, {"a": 1}),
+    ({"a": 1}, {"a": 1, "c": {"d": [1, 2]}}),
+    ({"nodes": [1, 2, 3]}, {"nodes": [1, 2, 3, 4, 5]}),
+    ({"nodes": [1, 2, 3, 4, 5]}, {"nodes": [9]}),
+    ({"nodes": [1, 2]}, {"nodes": []}),
+    ({"s": [{"name": "a", "x": 1}, {"name": "b"}]}, {"s": [{"name": "a", "x": 2, "y": 3}]}),
+    ({"a/b": 1, "c~d": {"e": 1}}, {"a/b": 2, "c~d": {}}),
+    ({"a": {"b": 1}}, {"a": [1, 2]}),
+    ({"a": None}, {"a": {"b": None}}),
+    ({"a": 1}, [1, 2]),
+    ({"m": [[1, 2], [3]]}, {"m": [[1], [3, 4, 5], []]}),
+]
+
+
+@pytest.mark.parametrize("old, new", PATCH_CASES)
+def test_diff_round_trips(old, new):
+    ops = server.diff_dash_status(old, new)
+    assert apply_patch(old, ops) == new
+    if old == new:
+        assert ops == []
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_diff_round_trips_through_client_apply_patch():
+    """Run the real applyPatch from the dashboard page against the server's diffs."""
+    match = re.search(r"function applyPatch\(doc, ops\) \{.*?\n        \}\n", DASH_PAGE.read_text(), re.S)
+    assert match, "applyPatch not found in dash.astro"
+    cases = [[old, server.diff_dash_status(old, new)] for old, new in PATCH_CASES]
+    script = (
+        match.group(0)
+        + "const cases = JSON.parse(require('fs').readFileSync(0, 'utf8'));\n"
+        + "console.log(JSON.stringify(cases.map(([doc, ops]) => applyPatch(doc, ops))));\n"
+    )
+    result = subprocess.run(["node", "-e", script], input=json.dumps(cases), capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout) == [new for _, new in PATCH_CASES]
+
+
+# =============================================================================
+# parse_byte_range
+# =============================================================================
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),  # open-ended
+    ("bytes=-200", (800, 999)),  # suffix
+    ("bytes=-5000", (0, 999)),  # suffix longer than the file
+    ("bytes=900-5000", (900, 999)),  # end clamped
+    ("bytes=1000-", (1000, 999)),  # unsatisfiable: start >= size
+    ("bytes=2000-2100", (2000, 999)),
+    ("bytes=5-1", None),  # end before start
+    ("bytes=0-1,5-6", None),  # multiple ranges are answered in full
+    ("items=0-1", None),
+    ("bytes=abc", None),
+    ("bytes=a-b", None),
+])
+def test_parse_byte_range(header, expected):
+    assert server.parse_byte_range(header, 1000) == expected
+
+
+# =============================================================================
+# RateLimiter
+# =============================================================================
+
+def test_rate_limiter_spends_and_refills():
+    limiter = server.RateLimiter(burst=2, period=10)  # one token every 5s
+    assert limiter.take("a", now=0) == 0
+    assert limiter.take("a", now=0) == 0
+    assert limiter.take("a", now=0) == pytest.approx(5.0)
+    assert limiter.take("a", now=2.5) == pytest.approx(2.5)  # rejections do not spend
+    assert limiter.take("b", now=2.5) == 0  # buckets are per client
+    assert limiter.take("a", now=100) == 0
+    assert limiter.take("a", now=100) == 0  # refill is capped at the burst
+    assert limiter.take("a", now=100) > 0
+
+
+def test_rate_limiter_evicts_idle_and_excess_clients():
+    limiter = server.RateLimiter(burst=1, period=10, max_clients=3)
+    for i, client in enumerate("abcd"):
+        limiter.take(client, now=i)
+    assert list(limiter.buckets) == ["b", "c", "d"]  # capped, least recently seen dropped
+    limiter.take("e", now=30)
+    assert list(limiter.buckets) == ["e"]  # idle for a full period
+
+
+# =============================================================================
+# read_capped
+# =============================================================================
+
+class ChunkedStream:
+    def __init__(self, data: bytes, size: int):
+        self.chunks = [data[i:i + size] for i in range(0, len(data), size)]
+
+    async def read(self, _):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+def test_read_capped_filters_lines_across_chunks(chunk_size):
+    data = b"notice\n[1, 2]\nnotice again\n[3]"
+    keep = lambda line: line.startswith(b"[")
+    assert asyncio.run(server.read_capped(ChunkedStream(data, chunk_size), 100, keep)) == b"[1, 2]\n[3]"
+
+
+def test_read_capped_limits():
+    data = b"0123456789\n[abcdefgh]\n"
+    assert asyncio.run(server.read_capped(ChunkedStream(data, 4), 5)) == b"01234"
+    keep = lambda line: line.startswith(b"[")
+    assert asyncio.run(server.read_capped(ChunkedStream(data, 4), 5, keep)) == b"[abcd"
+
+
+# =============================================================================
+# poll_miner_log
+# =============================================================================
+
+def result_line(name: str, quanta: float) -> bytes:
+    return f"2025-01-01 00:00:00 | INFO | signal_pool: {name}: QUANTA={quanta}, Sharpe=1.0, Return=2.0%\n".encode()
+
+
+@pytest.fixture
+def miner_log(monkeypatch):
+    """Feed poll_miner_log canned remote output: (file_id, start offset, body)."""
+    responses = []
+
+    async def fake_run_remote(node, command, timeout, encoding=None, label="remote", max_output=0):
+        file_id, start, body = responses.pop(0)
+        return f"{file_id} {start}\n".encode() + body
+
+    monkeypatch.setattr(server, "run_remote", fake_run_remote)
+    monkeypatch.setattr(server, "miner_log_state", {
+        "file_id": None, "offset": 0, "results": {}, "leaderboard": [], "winner": None,
+    })
+
+    def poll(file_id: str, start: int, body: bytes) -> dict:
+        responses.append((file_id, start, body))
+        asyncio.run(server.poll_miner_log({"hostname": "test"}))
+        return server.miner_log_state
+
+    return poll
+
+
+def test_miner_log_bootstrap_skips_partial_first_line(miner_log):
+    body = b"ignal_pool: half: QUANTA=9" + b"\n" + result_line("alpha", 1.5)
+    state = miner_log("1-1", 500, body)
+    assert [s["name"] for s in state["leaderboard"]] == ["alpha"]
+    assert state["offset"] == 500 + len(body)
+
+
+def test_miner_log_keeps_partial_trailing_line_for_next_poll(miner_log):
+    line = result_line("beta", 2.5)
+    state = miner_log("1-1", 0, result_line("alpha", 1.5) + line[:20])
+    assert [s["name"] for s in state["leaderboard"]] == ["alpha"]
+    offset = state["offset"]
+    assert offset == len(result_line("alpha", 1.5))
+
+    state = miner_log("1-1", offset, line)
+    assert [s["name"] for s in state["leaderboard"]] == ["beta", "alpha"]
+    assert state["offset"] == offset + len(line)
+
+
+def test_miner_log_rotation_restarts_from_zero(miner_log):
+    state = miner_log("1-1", 0, result_line("alpha", 1.0) + b"Signal pool winner: alpha\n")
+    assert state["winner"] == {"name": "alpha"}
+
+    # The remote side saw a new file identity and read from 0
+    body = result_line("alpha", 3.0)
+    state = miner_log("2-7", 0, body)
+    assert state["file_id"] == "2-7"
+    assert state["offset"] == len(body)
+    assert state["leaderboard"][0]["quanta_score"] == 3.0
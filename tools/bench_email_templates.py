@@ -0,0 +1,80 @@
+"""
+QUANTA Email Template Benchmark
+Times rendering of the email bodies server.py sends, using the precompiled
+templates in templates/email/ and a representative application payload.
+
+Usage:
+    python tools/bench_email_templates.py --iterations 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+SAMPLE_APPLICATION = {
+    "name": "Ada <b>Lovelace</b>",
+    "email": "ada@example.com",
+    "location": "London / UTC",
+    "discord": "ada#0001",
+    "twitter": "@ada",
+    "telegram": "",
+    "areas": ["protocol", "quant", "data"],
+    "portfolio": "https://example.com/ada?ref=<script>",
+    "resume_file": {"original_name": "resume.pdf", "size": 245_760},
+    "experience": "Analytical engines.\n" * 20,
+    "contribution": "Notes on the engine & its uses.",
+    "early_stage": True,
+    "submitted_at": "2025-01-01T00:00:00",
+    "ip": "127.0.0.1",
+}
+
+SAMPLE_CONTACT = {
+    "name": "Charles Babbage",
+    "email": "charles@example.com",
+    "subject": "Difference engine",
+    "message": "Hello <there>,\n" * 10,
+}
+
+
+def bench(label: str, fn, iterations: int):
+    """Run fn iterations times and print the per-render cost."""
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed / iterations * 1e6:8.1f} us/render  {iterations / elapsed:10.0f} renders/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark email template rendering")
+    parser.add_argument("--iterations", type=int, default=5000, help="Renders per template (default: 5000)")
+    args = parser.parse_args()
+
+    # server.py creates its data directories relative to the working directory
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    import server
+
+    start = time.perf_counter()
+    server.email_env.cache.clear()
+    for name in server.EMAIL_TEMPLATE_NAMES:
+        server.email_env.get_template(f"{name}.html")
+    print(f"{'compile all templates':<32} {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+    def team():
+        return server.render_email("team_notification", **server.team_notification_context(SAMPLE_APPLICATION))
+
+    bench("team_notification", team, args.iterations)
+    bench("contact_notification", lambda: server.render_email("contact_notification", data=SAMPLE_CONTACT), args.iterations)
+    bench("applicant_confirmation", lambda: server.render_email("applicant_confirmation"), args.iterations)
+    bench("applicant_confirmation (cached)", lambda: server.render_static_email("applicant_confirmation"), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
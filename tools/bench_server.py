@@ -0,0 +1,556 @@
+"""
+QUANTA Server Load Test
+Runs server.py's FastAPI app in a subprocess against local stand-ins and drives
+its hot paths, reporting latency percentiles, throughput, server RSS and
+spawned-process counts:
+
+    dash-status   GET /api/dash/status with N concurrent clients
+    ws-dash       hundreds of concurrent /ws/dash sockets (time to first frame,
+                  frames received while held open)
+    upload        POST /api/upload with PDF-signed payloads
+    apply         POST /api/apply, then the time for the outbox to drain into
+                  the SparkPost stand-in
+
+Stand-ins (all local, nothing touches rpi5 or SparkPost):
+    - an SSH server that runs each command in bash under a scratch HOME, so
+      the /proc health probe, the miner log tail and the metagraph agent
+      (forced into --stub mode) execute for real
+    - a `pm2` executable on PATH that prints a canned `pm2 jlist`
+    - an HTTP server that accepts SparkPost transmissions
+
+Linux only (RSS and child counts come from /proc).
+
+Usage:
+    python tools/bench_server.py
+    python tools/bench_server.py --nodes 50 --ws-clients 500 --ssh-delay 0.05 --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+import asyncssh
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parent.parent
+AREAS = ["protocol", "data", "quant", "devops", "frontend", "community"]
+STRATEGIES = ["momentum", "mean_reversion", "breakout", "carry", "volatility"]
+
+
+# =============================================================================
+# STAND-INS
+# =============================================================================
+
+def prepare_sandbox(root: Path, nodes: int) -> dict:
+    """Create the scratch HOME, fake pm2, node inventory and server working dir."""
+    home = root / "home"
+    (home / "quanta").mkdir(parents=True)
+    (home / "quanta-venv" / "bin").mkdir(parents=True)
+    # The server runs `source ~/quanta-venv/bin/activate && ... python3 -u -`;
+    # route that to this interpreter with the agent's stub subtensor
+    (home / "quanta-venv" / "bin" / "activate").write_text(
+        f'python3() {{ "{sys.executable}" "$@" --stub --stub-uids 64; }}\n'
+    )
+    with open(home / "signal_pool_miner.log", "w") as f:
+        for i, name in enumerate(STRATEGIES * 20):
+            f.write(miner_log_line(f"{name}: QUANTA={0.1 * (i % 7):.2f}, Sharpe={1 + i % 3:.2f}, Return={i % 11:.2f}%"))
+        f.write(miner_log_line(f"Signal pool winner: {STRATEGIES[0]}"))
+
+    bin_dir = root / "bin"
+    bin_dir.mkdir()
+    pm2 = bin_dir / "pm2"
+    pm2.write_text(
+        f"#!{sys.executable}\n"
+        "import json, os\n"
+        "with open(os.environ['BENCH_PM2_COUNTER'], 'a') as f:\n"
+        "    f.write('.')\n"
+        "names = ['qsub-net', 'quanta-api', 'quanta-agents', 'quanta-monitor', 'quanta-dashboard']\n"
+        "print(json.dumps([{'name': n, 'pm2_env': {'status': 'online'}, 'monit': {'cpu': 1, 'memory': 2 ** 20}}"
+        " for n in names]))\n"
+    )
+    pm2.chmod(0o755)
+
+    inventory = root / "cluster_nodes.json"
+    inventory.write_text(json.dumps([
+        {
+            "name": f"Bench Node {i}",
+            "hostname": f"bench-node-{i}",
+            "ip": "127.0.0.1",
+            "user": "bench",
+            "role": "full-node" if i == 0 else "worker",
+        }
+        for i in range(nodes)
+    ]))
+
+    workdir = root / "run"
+    workdir.mkdir()
+    return {"home": home, "bin": bin_dir, "inventory": inventory, "workdir": workdir,
+            "pm2_counter": root / "pm2_calls"}
+
+
+class BenchSSHServer(asyncssh.SSHServer):
+    def begin_auth(self, username: str) -> bool:
+        return False  # no authentication
+
+
+async def start_ssh_server(home: Path, delay: float, counters: dict):
+    """SSH server that runs every command in bash with HOME pointed at the sandbox."""
+    env = {**os.environ, "HOME": str(home)}
+
+    async def handle(process: asyncssh.SSHServerProcess):
+        counters["remote_commands"] += 1
+        if delay:
+            await asyncio.sleep(delay)
+        child = await asyncio.create_subprocess_exec(
+            "bash", "-c", process.command or "true",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+            cwd=str(home),
+            start_new_session=True,
+        )
+
+        async def pump_stdin():
+            try:
+                while data := await process.stdin.read(65536):
+                    child.stdin.write(data)
+                    await child.stdin.drain()
+            except (asyncssh.Error, OSError):
+                pass
+            finally:
+                child.stdin.close()
+
+        stdin_task = asyncio.create_task(pump_stdin())
+        try:
+            while data := await child.stdout.read(65536):
+                process.stdout.write(data)
+                await process.stdout.drain()
+            process.exit(await child.wait())
+        except (asyncssh.Error, OSError, BrokenPipeError):
+            pass
+        finally:
+            stdin_task.cancel()
+            if child.returncode is None:
+                os.killpg(child.pid, signal.SIGKILL)
+                await child.wait()
+
+    server = await asyncssh.create_server(
+        BenchSSHServer, "127.0.0.1", 0,
+        server_host_keys=[asyncssh.generate_private_key("ssh-ed25519")],
+        process_factory=handle,
+        encoding=None,
+    )
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def start_sparkpost(delay: float, counters: dict):
+    """HTTP server accepting SparkPost transmissions."""
+    async def transmissions(request: web.Request):
+        payload = await request.json()
+        if delay:
+            await asyncio.sleep(delay)
+        counters["transmissions"] += 1
+        counters["recipients"] += len(payload.get("recipients", []))
+        return web.json_response({"results": {"id": str(counters["transmissions"])}})
+
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_post("/api/v1/transmissions", transmissions)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+def miner_log_line(message: str) -> str:
+    """Format a line the way the signal pool miner logs it (the parser keys on the tag)."""
+    return f"{time.strftime('%Y-%m-%d %H:%M:%S')} | INFO | signal_pool: {message}\n"
+
+
+async def append_miner_log(path: Path):
+    """Keep the miner log growing so the follower reads incrementally."""
+    i = 0
+    while True:
+        await asyncio.sleep(1)
+        with open(path, "a") as f:
+            name = STRATEGIES[i % len(STRATEGIES)]
+            f.write(miner_log_line(f"{name}: QUANTA={0.05 * (i % 13):.2f}, Sharpe={1.5:.2f}, Return={i % 9:.2f}%"))
+        i += 1
+
+
+# =============================================================================
+# SERVER PROCESS
+# =============================================================================
+
+def serve(port: int, ssh_port: int):
+    """Run server.app with SSH connections redirected to the stand-in (subprocess mode)."""
+    sys.path.insert(0, str(ROOT))
+    connect = asyncssh.connect
+
+    def bench_connect(host, **kwargs):
+        return connect("127.0.0.1", port=ssh_port, known_hosts=None, **kwargs)
+
+    asyncssh.connect = bench_connect
+    import server
+    import uvicorn
+    # Every bench client shares 127.0.0.1; measure the handlers, not admission control
+    server.rate_limiters = {name: server.RateLimiter(10**9, 1) for name in server.RATE_LIMITS}
+    server.UPLOAD_MAX_CONCURRENT = server.UPLOAD_MAX_CONCURRENT_PER_IP = 10**9
+    uvicorn.run(server.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def process_stats(pid: int) -> dict:
+    """Current RSS and direct child count of a process, from /proc."""
+    rss_kb = 0
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                rss_kb = int(line.split()[1])
+    except OSError:
+        pass
+
+    children = 0
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = Path(entry.path, "stat").read_text()
+        except OSError:
+            continue
+        # Fields after the parenthesised command name: state, ppid, ...
+        if int(stat.rsplit(")", 1)[1].split()[1]) == pid:
+            children += 1
+    return {"rss_mb": rss_kb / 1024, "children": children}
+
+
+class ResourceSampler:
+    """Tracks peak server RSS and child processes between mark() calls."""
+
+    def __init__(self, pid: int, interval: float = 0.2):
+        self.pid = pid
+        self.interval = interval
+        self.peak = {"rss_mb": 0.0, "children": 0}
+
+    def mark(self) -> dict:
+        peak, self.peak = self.peak, {"rss_mb": 0.0, "children": 0}
+        return peak
+
+    async def run(self):
+        while True:
+            stats = await asyncio.to_thread(process_stats, self.pid)
+            for key, value in stats.items():
+                self.peak[key] = max(self.peak[key], value)
+            await asyncio.sleep(self.interval)
+
+
+# =============================================================================
+# SCENARIOS
+# =============================================================================
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(name: str, latencies: list, errors: int, elapsed: float, **extra) -> dict:
+    return {
+        "scenario": name,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+        **extra,
+    }
+
+
+async def run_requests(name: str, count: int, concurrency: int, request_fn) -> dict:
+    """Call request_fn(i) count times with bounded concurrency; True means success."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                ok = await request_fn(i)
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return summarize(name, latencies, errors, time.perf_counter() - started)
+
+
+async def bench_dash_status(session: aiohttp.ClientSession, base: str, args) -> dict:
+    """A response only counts as a success if the miner log made it into the leaderboard."""
+    leaderboard = 0
+
+    async def request(i: int) -> bool:
+        nonlocal leaderboard
+        async with session.get(f"{base}/api/dash/status") as response:
+            if response.status != 200:
+                return False
+            strategies = (await response.json()).get("strategies", [])
+            leaderboard = max(leaderboard, len(strategies))
+            return bool(strategies)
+
+    result = await run_requests("dash-status", args.requests, args.concurrency, request)
+    result["leaderboard"] = leaderboard
+    return result
+
+
+async def bench_ws_dash(session: aiohttp.ClientSession, base: str, args) -> dict:
+    """Open many sockets at once, time the first frame, then hold them open."""
+    ws_url = base.replace("http://", "ws://") + "/ws/dash"
+    first_frame = []
+    frames = 0
+    errors = 0
+    release = asyncio.Event()
+
+    async def client():
+        nonlocal frames, errors
+        start = time.perf_counter()
+        try:
+            async with session.ws_connect(ws_url, heartbeat=None) as ws:
+                message = await ws.receive(timeout=30)
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    errors += 1
+                    return
+                first_frame.append(time.perf_counter() - start)
+                frames += 1
+                while not release.is_set():
+                    receive = asyncio.create_task(ws.receive())
+                    done, _ = await asyncio.wait({receive, asyncio.create_task(release.wait())},
+                                                 return_when=asyncio.FIRST_COMPLETED)
+                    if receive not in done:
+                        receive.cancel()
+                        break
+                    if receive.result().type != aiohttp.WSMsgType.TEXT:
+                        errors += 1
+                        return
+                    frames += 1
+        except Exception:
+            errors += 1
+
+    started = time.perf_counter()
+    clients = [asyncio.create_task(client()) for _ in range(args.ws_clients)]
+    await asyncio.sleep(args.ws_hold)
+    release.set()
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - started
+    result = summarize("ws-dash", first_frame, errors, elapsed, frames=frames)
+    result["rps"] = frames / elapsed  # frames delivered per second across all sockets
+    return result
+
+
+async def bench_upload(session: aiohttp.ClientSession, base: str, args, file_ids: list) -> dict:
+    async def request(i: int) -> bool:
+        body = b"%PDF-1.4\n" + os.urandom(args.upload_size)
+        form = aiohttp.FormData()
+        form.add_field("file", body, filename=f"resume-{i}.pdf", content_type="application/pdf")
+        async with session.post(f"{base}/api/upload", data=form) as response:
+            if response.status != 200:
+                return False
+            file_ids.append((await response.json())["file_id"])
+            return True
+
+    return await run_requests("upload", args.requests, args.concurrency, request)
+
+
+async def bench_apply(session: aiohttp.ClientSession, base: str, args, file_ids: list, counters: dict) -> dict:
+    sent_before = counters["transmissions"]
+
+    async def request(i: int) -> bool:
+        application = {
+            "name": f"Bench Applicant {i}",
+            "email": f"applicant{i}@example.com",
+            "experience": "Load testing. " * 20,
+            "areas": [AREAS[i % len(AREAS)], AREAS[(i + 1) % len(AREAS)]],
+            "portfolio": "https://example.com/portfolio",
+            "early_stage": True,
+        }
+        if file_ids:
+            application["resume_file_id"] = file_ids[i % len(file_ids)]
+        async with session.post(f"{base}/api/apply", json=application) as response:
+            await response.read()
+            return response.status == 200
+
+    result = await run_requests("apply", args.requests, args.concurrency, request)
+
+    # Each application queues a team notification and a (batched) confirmation
+    drain_start = time.perf_counter()
+    last, stable_since = -1, time.perf_counter()
+    while time.perf_counter() - drain_start < args.drain_timeout:
+        await asyncio.sleep(0.25)
+        if counters["transmissions"] != last:
+            last, stable_since = counters["transmissions"], time.perf_counter()
+        elif time.perf_counter() - stable_since > 2:
+            break
+    result["emails_sent"] = counters["transmissions"] - sent_before
+    result["outbox_drain_s"] = stable_since - drain_start
+    return result
+
+
+# =============================================================================
+# DRIVER
+# =============================================================================
+
+def print_result(result: dict):
+    extra = "  ".join(
+        f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}"
+        for key, value in result.items()
+        if key not in ("scenario", "requests", "errors", "rps", "p50_ms", "p99_ms", "max_ms")
+    )
+    print(
+        f"{result['scenario']:<12} {result['requests']:>6} {result['errors']:>6} {result['rps']:>9.1f} "
+        f"{result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['max_ms']:>9.1f}  {extra}"
+    )
+
+
+async def drive(args) -> list:
+    counters = {"remote_commands": 0, "transmissions": 0, "recipients": 0}
+    root = Path(tempfile.mkdtemp(prefix="quanta-bench-"))
+    sandbox = prepare_sandbox(root, args.nodes)
+    ssh_server, ssh_port = await start_ssh_server(sandbox["home"], args.ssh_delay, counters)
+    sparkpost, sparkpost_port = await start_sparkpost(args.sparkpost_delay, counters)
+    log_writer = asyncio.create_task(append_miner_log(sandbox["home"] / "signal_pool_miner.log"))
+
+    port = free_port()
+    env = {
+        **os.environ,
+        "PATH": f"{sandbox['bin']}{os.pathsep}{os.environ.get('PATH', '')}",
+        "SPARKPOST_KEY": "bench",
+        "SPARKPOST_API_URL": f"http://127.0.0.1:{sparkpost_port}/api/v1/transmissions",
+        "CLUSTER_NODES_FILE": str(sandbox["inventory"]),
+        "BENCH_PM2_COUNTER": str(sandbox["pm2_counter"]),
+    }
+    server = subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "--serve", "--port", str(port), "--ssh-port", str(ssh_port)],
+        cwd=sandbox["workdir"],
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    results = []
+    sampler_task = None
+    try:
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+            for _ in range(100):
+                try:
+                    async with session.get(f"{base}/api/applications?limit=1") as response:
+                        if response.status == 200:
+                            break
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.2)
+            else:
+                raise RuntimeError("Server did not start")
+
+            sampler = ResourceSampler(server.pid)
+            sampler_task = asyncio.create_task(sampler.run())
+            file_ids = []
+
+            print(f"{'scenario':<12} {'reqs':>6} {'errors':>6} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+            scenarios = {
+                "dash-status": lambda: bench_dash_status(session, base, args),
+                "ws-dash": lambda: bench_ws_dash(session, base, args),
+                "upload": lambda: bench_upload(session, base, args, file_ids),
+                "apply": lambda: bench_apply(session, base, args, file_ids, counters),
+            }
+            for name in args.scenarios:
+                sampler.mark()
+                result = await scenarios[name]()
+                peak = sampler.mark()
+                result["peak_rss_mb"] = peak["rss_mb"]
+                result["peak_children"] = peak["children"]
+                results.append(result)
+                print_result(result)
+
+        pm2_calls = sandbox["pm2_counter"].stat().st_size if sandbox["pm2_counter"].exists() else 0
+        totals = {
+            "scenario": "totals",
+            "remote_commands": counters["remote_commands"],
+            "pm2_spawns": pm2_calls,
+            "sparkpost_transmissions": counters["transmissions"],
+            "sparkpost_recipients": counters["recipients"],
+        }
+        results.append(totals)
+        print("\n" + "  ".join(f"{key}={value}" for key, value in totals.items() if key != "scenario"))
+    finally:
+        if sampler_task:
+            sampler_task.cancel()
+        log_writer.cancel()
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        ssh_server.close()
+        await sparkpost.cleanup()
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+        else:
+            print(f"Sandbox kept at {root}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test server.py against local stand-ins")
+    parser.add_argument("--scenarios", nargs="+", default=["dash-status", "ws-dash", "upload", "apply"],
+                        choices=["dash-status", "ws-dash", "upload", "apply"], help="Scenarios to run, in order")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per HTTP scenario (default: 500)")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent HTTP clients (default: 50)")
+    parser.add_argument("--ws-clients", type=int, default=300, help="Concurrent /ws/dash sockets (default: 300)")
+    parser.add_argument("--ws-hold", type=float, default=15, help="Seconds to hold sockets open (default: 15)")
+    parser.add_argument("--upload-size", type=int, default=256 * 1024, help="Upload payload bytes (default: 256KB)")
+    parser.add_argument("--nodes", type=int, default=1, help="Cluster nodes in the inventory (default: 1)")
+    parser.add_argument("--ssh-delay", type=float, default=0.0, help="Added latency per remote command, seconds")
+    parser.add_argument("--sparkpost-delay", type=float, default=0.0, help="Added latency per transmission, seconds")
+    parser.add_argument("--drain-timeout", type=float, default=60, help="Max seconds to wait for the outbox (default: 60)")
+    parser.add_argument("--json", metavar="PATH", help="Also write results as JSON")
+    parser.add_argument("--keep", action="store_true", help="Keep the sandbox directory")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--ssh-port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.ssh_port)
+        return
+
+    results = asyncio.run(drive(args))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
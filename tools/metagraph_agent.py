@@ -0,0 +1,139 @@
+"""
+QUANTA Metagraph Agent
+Keeps one subtensor connection open and streams metagraph + subnet snapshots
+to stdout as newline-delimited JSON, one object per line:
+
+    {"type": "metagraph", "uids": [...], "total": 3, "timestamp": "..."}
+    {"type": "subnet", "tao_pool": 10.0, "alpha_pool": 10.0, ...}
+    {"type": "error", "message": "...", "timestamp": "..."}
+
+server.py pipes this file to `python3 -u -` on the chain node over SSH and
+consumes the stream, so bittensor is imported once per agent rather than once
+per dashboard refresh.
+
+Usage:
+    python tools/metagraph_agent.py --stub --interval 2
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime
+
+
+class StubScalar:
+    """Mimics the tensor scalars bittensor returns (value via .item())."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def item(self):
+        return self.value
+
+
+class StubAxon:
+    def __init__(self, port: int):
+        self.port = port
+
+
+class StubMetagraph:
+    def __init__(self, n: int):
+        self.n = StubScalar(n)
+        self.hotkeys = [f"5Stub{uid:04d}{'x' * 43}" for uid in range(n)]
+        self.S = [StubScalar(round(random.uniform(0, 1000), 4) if uid % 3 == 0 else 0.0) for uid in range(n)]
+        self.axons = [StubAxon(8091 + uid if uid % 4 else 0) for uid in range(n)]
+
+
+class StubSubnetInfo:
+    def __init__(self):
+        self.tao_in = round(random.uniform(9.5, 10.5), 4)
+        self.alpha_in = round(random.uniform(9.5, 10.5), 4)
+        self.emission_value = round(random.uniform(0, 0.01), 6)
+        self.tempo = 100
+
+
+class StubSubtensor:
+    """Stand-in for bt.subtensor so the agent can run without a chain."""
+
+    def __init__(self, uids: int):
+        self.uids = uids
+
+    def metagraph(self, netuid: int) -> StubMetagraph:
+        return StubMetagraph(self.uids)
+
+    def get_subnet_info(self, netuid: int) -> StubSubnetInfo:
+        return StubSubnetInfo()
+
+
+def connect(args):
+    """Open a subtensor connection (or the stub)."""
+    if args.stub:
+        return StubSubtensor(args.stub_uids)
+
+    import bittensor as bt
+    return bt.subtensor(network=args.network)
+
+
+def collect_metagraph(sub, netuid: int) -> dict:
+    """Snapshot UIDs, hotkeys, stake and axon ports."""
+    meta = sub.metagraph(netuid=netuid)
+    uids = [
+        {
+            "uid": uid,
+            "hotkey": meta.hotkeys[uid][:16],
+            "stake": float(meta.S[uid].item()),
+            "axon_port": meta.axons[uid].port,
+        }
+        for uid in range(meta.n.item())
+    ]
+    return {"uids": uids, "total": meta.n.item()}
+
+
+def collect_subnet(sub, netuid: int) -> dict:
+    """Snapshot subnet pool and emission information."""
+    info = sub.get_subnet_info(netuid=netuid)
+    return {
+        "tao_pool": float(info.tao_in) if hasattr(info, "tao_in") else 10.0,
+        "alpha_pool": float(info.alpha_in) if hasattr(info, "alpha_in") else 10.0,
+        "emission": float(info.emission_value) if hasattr(info, "emission_value") else 0.0,
+        "tempo": int(info.tempo) if hasattr(info, "tempo") else 100,
+    }
+
+
+def emit(kind: str, data: dict):
+    """Write one NDJSON record and flush so the server sees it immediately."""
+    record = {"type": kind, **data, "timestamp": datetime.now().isoformat()}
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream metagraph snapshots as NDJSON")
+    parser.add_argument("--network", default="local", help="Subtensor network (default: local)")
+    parser.add_argument("--netuid", type=int, default=1, help="Subnet UID (default: 1)")
+    parser.add_argument("--interval", type=float, default=12, help="Seconds between snapshots (default: 12)")
+    parser.add_argument("--stub", action="store_true", help="Use a synthetic subtensor instead of bittensor")
+    parser.add_argument("--stub-uids", type=int, default=16, help="UIDs in the stub metagraph (default: 16)")
+    args = parser.parse_args()
+
+    sub = None
+    while True:
+        try:
+            if sub is None:
+                sub = connect(args)
+            emit("metagraph", collect_metagraph(sub, args.netuid))
+            emit("subnet", collect_subnet(sub, args.netuid))
+        except Exception as e:
+            # Drop the connection; it is reopened on the next iteration
+            emit("error", {"message": str(e)[:200]})
+            sub = None
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass